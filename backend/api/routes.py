@@ -1,41 +1,221 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, Request
 from typing import List
+import json
+import logging
+import re
+
+from pydantic import TypeAdapter
 
 from models.trending import (
-    TrendingAnalysisRequest, TrendingAnalysisResponse, 
-    PlatformType, AnalysisSummary
+    TrendingAnalysisRequest, TrendingAnalysisResponse,
+    QuickAnalysisRequest, NlpSearchRequest,
+    PlatformType, AnalysisSummary, TrendingTopic, GitHubRepo
 )
 from services.trending_analyzer import TrendingAnalyzer
+from services.cache import ResponseCache, make_cache_key
+from services.semantic_cache import SemanticCache
+from core.config import settings
+
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+logger = logging.getLogger(__name__)
 
 # Create router
 trending_router = APIRouter(prefix="/trending", tags=["trending"])
 
+# Per-IP rate limiter; shared Redis storage when configured so limits
+# hold across workers
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=settings.REDIS_URL or "memory://"
+)
+
 # Initialize services
-trending_analyzer = TrendingAnalyzer()
+response_cache = ResponseCache()
+semantic_cache = SemanticCache()
+
+def get_analyzer(request: Request) -> TrendingAnalyzer:
+    """Fetch the process-wide analyzer built in the app lifespan"""
+    return request.app.state.analyzer
+
+# Built once: pydantic-core serializes whole repo lists in C, including datetimes
+_REPO_LIST_ADAPTER = TypeAdapter(List[GitHubRepo])
+
+def _log_analysis_summary(analyzer: TrendingAnalyzer, trending_topic: TrendingTopic):
+    """Compute summary stats off the request path (logging/metrics only)"""
+    try:
+        summary = analyzer.generate_analysis_summary(trending_topic)
+        logger.info(
+            "Analysis summary for '%s': %s repos across %s platforms",
+            trending_topic.topic, summary.total_repos, len(summary.platform_stats)
+        )
+    except Exception as e:
+        logger.warning("Error generating analysis summary: %s", e)
+
+# Precomputed responses for static GET endpoints (built once at import time)
+_PLATFORMS_RESPONSE = {
+    "platforms": [
+        {
+            "id": PlatformType.GITHUB,
+            "name": "GitHub",
+            "description": "Analyze trending repositories, languages, and contributors",
+            "capabilities": ["Repository analysis", "Language trends", "Contributor insights"]
+        },
+        {
+            "id": PlatformType.TWITTER,
+            "name": "X (Twitter)",
+            "description": "Analyze trending posts, hashtags, and engagement",
+            "capabilities": ["Post analysis", "Hashtag trends", "Engagement metrics"]
+        },
+        {
+            "id": PlatformType.REDDIT,
+            "name": "Reddit",
+            "description": "Analyze trending discussions and community engagement",
+            "capabilities": ["Post analysis", "Community metrics", "Keyword trends"]
+        }
+    ]
+}
+
+_HEALTH_RESPONSE = {
+    "status": "healthy",
+    "service": "Trending Analysis",
+    "available_platforms": len(PlatformType),
+    "timestamp": "2024-01-01T00:00:00Z"
+}
+
+_EXAMPLE_QUERIES_RESPONSE = {
+    "example_queries": [
+        {
+            "query": "Python machine learning",
+            "description": "Analyze trending topics in Python ML ecosystem",
+            "expected_insights": ["Popular ML libraries", "GitHub repositories", "Community discussions"]
+        },
+        {
+            "query": "JavaScript frameworks",
+            "description": "Explore trending JavaScript frameworks and tools",
+            "expected_insights": ["Framework popularity", "GitHub stars", "Developer sentiment"]
+        },
+        {
+            "query": "Data science tools",
+            "description": "Discover trending data science tools and platforms",
+            "expected_insights": ["Tool adoption", "Community engagement", "GitHub activity"]
+        },
+        {
+            "query": "Web development trends",
+            "description": "Analyze current web development trends",
+            "expected_insights": ["Technology adoption", "Community discussions", "Repository activity"]
+        },
+        {
+            "query": "Open source projects",
+            "description": "Explore trending open source projects",
+            "expected_insights": ["Project popularity", "Contributor activity", "Community engagement"]
+        }
+    ]
+}
+
+_NLP_EXAMPLES_RESPONSE = {
+    "nlp_examples": [
+        {
+            "query": "repos with more than 100 stars where mcp server is used to connect notion",
+            "description": "Find popular MCP server implementations for Notion integration",
+            "parses_to": "mcp server + topic:notion + stars:>=100"
+        },
+        {
+            "query": "python projects with at least 50 forks created since 2023",
+            "description": "Find active Python projects with community engagement",
+            "parses_to": "python + forks:>=50 + created:>=2023-01-01"
+        },
+        {
+            "query": "javascript libraries with typescript support and more than 200 stars",
+            "description": "Find popular JS libraries with TypeScript support",
+            "parses_to": "javascript + topic:typescript + stars:>=200"
+        },
+        {
+            "query": "machine learning tools in python with more than 1000 stars",
+            "description": "Find highly popular Python ML tools",
+            "parses_to": "machine learning + language:python + stars:>=1000"
+        },
+        {
+            "query": "web frameworks with react support and at least 500 forks",
+            "description": "Find popular web frameworks supporting React",
+            "parses_to": "web frameworks + topic:react + forks:>=500"
+        }
+    ],
+    "supported_patterns": [
+        "more than X stars/forks/contributors",
+        "at least X stars/forks/contributors",
+        "in [language]",
+        "created since [year]",
+        "with [topic]",
+        "using [technology]",
+        "has issues/wiki",
+        "archived/not archived",
+        "forked/not forked"
+    ]
+}
 
 @trending_router.post("/analyze", response_model=TrendingAnalysisResponse)
-async def analyze_trending_topic(request: TrendingAnalysisRequest):
+@limiter.limit("10/minute")
+async def analyze_trending_topic(request: Request, analysis_request: TrendingAnalysisRequest, background_tasks: BackgroundTasks, analyzer: TrendingAnalyzer = Depends(get_analyzer)):
     """
     Analyze trending topics across multiple platforms
     """
     try:
-        # Validate request
-        if not request.query.strip():
-            raise HTTPException(status_code=400, detail="Query cannot be empty")
-        
-        if not request.platforms:
-            raise HTTPException(status_code=400, detail="At least one platform must be selected")
-        
+        # Empty-query/platform validation happens at the Pydantic layer,
+        # so invalid bodies are rejected with a 422 before this handler runs
+
+        # Check cache before running the full analysis pipeline.
+        # platforms is a frozenset, so sort it once into a canonical key
+        # shared by the exact and semantic tiers.
+        platforms_key = sorted(analysis_request.platforms)
+        cache_key = make_cache_key(
+            endpoint="analyze",
+            query=analysis_request.query,
+            platforms=platforms_key,
+            max_results=analysis_request.max_results_per_platform
+        )
+        cached = await response_cache.get(cache_key)
+        if cached is not None:
+            return TrendingAnalysisResponse(
+                success=True,
+                message=f"Successfully analyzed trending topic: {analysis_request.query}",
+                data=TrendingTopic.model_validate_json(cached)
+            )
+
+        # Fall back to semantically similar cached queries ("LLM agents"
+        # vs "llm agent"), as long as they asked for the same platforms
+        # and result count
+        normalized_query = re.sub(r'\s+', ' ', analysis_request.query.lower().strip())
+        semantic_hit = await semantic_cache.get(normalized_query, namespace="analyze")
+        if (semantic_hit is not None
+                and semantic_hit["platforms"] == platforms_key
+                and semantic_hit["max_results"] == analysis_request.max_results_per_platform):
+            return TrendingAnalysisResponse(
+                success=True,
+                message=f"Successfully analyzed trending topic: {analysis_request.query}",
+                data=TrendingTopic.model_validate_json(semantic_hit["topic"])
+            )
+
         # Perform analysis
-        trending_topic = await trending_analyzer.analyze_trending_topic(request)
-        
-        # Generate summary
-        summary = trending_analyzer.generate_analysis_summary(trending_topic)
-        
+        trending_topic = await analyzer.analyze_trending_topic(analysis_request)
+
+        # The summary isn't part of this response - compute it after the
+        # response is sent instead of on the critical path
+        background_tasks.add_task(_log_analysis_summary, analyzer, trending_topic)
+
+        # Cache the result for repeated queries
+        topic_json = trending_topic.model_dump_json()
+        await response_cache.set(cache_key, topic_json)
+        await semantic_cache.add(normalized_query, {
+            "platforms": platforms_key,
+            "max_results": analysis_request.max_results_per_platform,
+            "topic": topic_json
+        }, namespace="analyze")
+
         return TrendingAnalysisResponse(
             success=True,
-            message=f"Successfully analyzed trending topic: {request.query}",
+            message=f"Successfully analyzed trending topic: {analysis_request.query}",
             data=trending_topic
         )
         
@@ -51,27 +231,23 @@ async def get_available_platforms():
     """
     Get list of available platforms for analysis
     """
-    return {
-        "platforms": [
-            {
-                "id": PlatformType.GITHUB,
-                "name": "GitHub",
-                "description": "Analyze trending repositories, languages, and contributors",
-                "capabilities": ["Repository analysis", "Language trends", "Contributor insights"]
-            }
-        ]
-    }
+    return _PLATFORMS_RESPONSE
 
 @trending_router.get("/health")
-async def health_check():
+@limiter.limit("60/minute")
+async def health_check(request: Request):
     """
     Health check for trending analysis service
     """
+    return _HEALTH_RESPONSE
+
+@trending_router.get("/metrics")
+async def get_cache_metrics(analyzer: TrendingAnalyzer = Depends(get_analyzer)):
+    """
+    Cache and conditional-GET counters for the GitHub layer
+    """
     return {
-        "status": "healthy",
-        "service": "Trending Analysis",
-        "available_platforms": len(PlatformType),
-        "timestamp": "2024-01-01T00:00:00Z"
+        "github_conditional_get": analyzer.github_service.cond_http.stats
     }
 
 @trending_router.get("/example-queries")
@@ -79,53 +255,25 @@ async def get_example_queries():
     """
     Get example queries for trending analysis
     """
-    return {
-        "example_queries": [
-            {
-                "query": "Python machine learning",
-                "description": "Analyze trending topics in Python ML ecosystem",
-                "expected_insights": ["Popular ML libraries", "GitHub repositories", "Community discussions"]
-            },
-            {
-                "query": "JavaScript frameworks",
-                "description": "Explore trending JavaScript frameworks and tools",
-                "expected_insights": ["Framework popularity", "GitHub stars", "Developer sentiment"]
-            },
-            {
-                "query": "Data science tools",
-                "description": "Discover trending data science tools and platforms",
-                "expected_insights": ["Tool adoption", "Community engagement", "GitHub activity"]
-            },
-            {
-                "query": "Web development trends",
-                "description": "Analyze current web development trends",
-                "expected_insights": ["Technology adoption", "Community discussions", "Repository activity"]
-            },
-            {
-                "query": "Open source projects",
-                "description": "Explore trending open source projects",
-                "expected_insights": ["Project popularity", "Contributor activity", "Community engagement"]
-            }
-        ]
-    }
+    return _EXAMPLE_QUERIES_RESPONSE
 
 @trending_router.post("/quick-analysis")
-async def quick_analysis(query: str, platforms: List[PlatformType] = None):
+@limiter.limit("10/minute")
+async def quick_analysis(request: Request, quick_request: QuickAnalysisRequest, analyzer: TrendingAnalyzer = Depends(get_analyzer)):
     """
     Quick analysis with minimal configuration
     """
-    if not platforms:
-        platforms = [PlatformType.GITHUB]
-    
-    request = TrendingAnalysisRequest(
+    query = quick_request.query
+
+    analysis_request = TrendingAnalysisRequest(
         query=query,
-        platforms=platforms,
+        platforms=quick_request.platforms,
         max_results_per_platform=15
     )
-    
+
     try:
-        trending_topic = await trending_analyzer.analyze_trending_topic(request)
-        summary = trending_analyzer.generate_analysis_summary(trending_topic)
+        trending_topic = await analyzer.analyze_trending_topic(analysis_request)
+        summary = analyzer.generate_analysis_summary(trending_topic)
         
         return {
             "success": True,
@@ -152,7 +300,8 @@ async def quick_analysis(query: str, platforms: List[PlatformType] = None):
         }
 
 @trending_router.post("/nlp-search")
-async def nlp_based_search(natural_query: str, max_results: int = 20):
+@limiter.limit("10/minute")
+async def nlp_based_search(request: Request, search_request: NlpSearchRequest, analyzer: TrendingAnalyzer = Depends(get_analyzer)):
     """
     Search repositories using natural language processing
     
@@ -162,7 +311,26 @@ async def nlp_based_search(natural_query: str, max_results: int = 20):
     - "javascript libraries with typescript support and more than 200 stars"
     """
     try:
-        nlp_results = await trending_analyzer.analyze_trending_with_nlp(natural_query, max_results)
+        natural_query = search_request.natural_query
+        max_results = search_request.max_results
+
+        # Normalize whitespace/case so trivially different phrasings share a cache entry
+        normalized_query = re.sub(r'\s+', ' ', natural_query.lower().strip())
+        cache_key = make_cache_key(
+            endpoint="nlp-search",
+            query=normalized_query,
+            max_results=max_results
+        )
+        cached = await response_cache.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
+
+        # Fall back to semantically similar cached queries
+        semantic_hit = await semantic_cache.get(normalized_query, namespace="nlp-search")
+        if semantic_hit is not None:
+            return semantic_hit
+
+        nlp_results = await analyzer.analyze_trending_with_nlp(natural_query, max_results)
         
         if "error" in nlp_results:
             return {
@@ -170,32 +338,16 @@ async def nlp_based_search(natural_query: str, max_results: int = 20):
                 "error": nlp_results["error"]
             }
         
-        return {
+        result = {
             "success": True,
             "natural_query": natural_query,
             "parsed_query": nlp_results["query_analysis"]["original_query"],
             "github_query": nlp_results["search_query"],
             "parsed_filters": nlp_results["parsed_filters"],
             "total_repos": nlp_results["trending_topic"].overall_score,
-            "repositories": [
-                {
-                    "name": repo.name,
-                    "full_name": repo.full_name,
-                    "description": repo.description,
-                    "html_url": repo.html_url,
-                    "stargazers_count": repo.stargazers_count,
-                    "forks_count": repo.forks_count,
-                    "language": repo.language,
-                    "topics": repo.topics,
-                    "created_at": repo.created_at.isoformat(),
-                    "updated_at": repo.updated_at.isoformat(),
-                    "open_issues_count": repo.open_issues_count,
-                    "contributors_count": repo.contributors_count,
-                    "commits_count": repo.commits_count,
-                    "tech_stack": repo.tech_stack
-                }
-                for repo in nlp_results["trending_topic"].github_data
-            ],
+            "repositories": _REPO_LIST_ADAPTER.dump_python(
+                nlp_results["trending_topic"].github_data, mode="json"
+            ),
             "summary": {
                 "total_repos": nlp_results["summary"].total_repos,
                 "top_languages": nlp_results["summary"].top_languages[:5],
@@ -203,7 +355,12 @@ async def nlp_based_search(natural_query: str, max_results: int = 20):
             },
             "search_suggestions": nlp_results["suggestions"]
         }
-        
+
+        await response_cache.set(cache_key, json.dumps(result))
+        await semantic_cache.add(normalized_query, result, namespace="nlp-search")
+
+        return result
+
     except Exception as e:
         return {
             "success": False,
@@ -215,43 +372,4 @@ async def get_nlp_examples():
     """
     Get examples of natural language queries
     """
-    return {
-        "nlp_examples": [
-            {
-                "query": "repos with more than 100 stars where mcp server is used to connect notion",
-                "description": "Find popular MCP server implementations for Notion integration",
-                "parses_to": "mcp server + topic:notion + stars:>=100"
-            },
-            {
-                "query": "python projects with at least 50 forks created since 2023",
-                "description": "Find active Python projects with community engagement",
-                "parses_to": "python + forks:>=50 + created:>=2023-01-01"
-            },
-            {
-                "query": "javascript libraries with typescript support and more than 200 stars",
-                "description": "Find popular JS libraries with TypeScript support",
-                "parses_to": "javascript + topic:typescript + stars:>=200"
-            },
-            {
-                "query": "machine learning tools in python with more than 1000 stars",
-                "description": "Find highly popular Python ML tools",
-                "parses_to": "machine learning + language:python + stars:>=1000"
-            },
-            {
-                "query": "web frameworks with react support and at least 500 forks",
-                "description": "Find popular web frameworks supporting React",
-                "parses_to": "web frameworks + topic:react + forks:>=500"
-            }
-        ],
-        "supported_patterns": [
-            "more than X stars/forks/contributors",
-            "at least X stars/forks/contributors", 
-            "in [language]",
-            "created since [year]",
-            "with [topic]",
-            "using [technology]",
-            "has issues/wiki",
-            "archived/not archived",
-            "forked/not forked"
-        ]
-    }
+    return _NLP_EXAMPLES_RESPONSE
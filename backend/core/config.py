@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from typing import Optional
+from functools import lru_cache
 import os
 
 class Settings(BaseSettings):
@@ -7,18 +8,52 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    WORKERS: int = max(1, (os.cpu_count() or 2))  # ignored when DEBUG/reload is on
+    FRONTEND_ORIGIN: str = "http://localhost:3000"
     
     # GitHub API Configuration
     GITHUB_TOKEN: Optional[str] = None
-    
+
+    # Twitter/X API Configuration
+    TWITTER_API_KEY: Optional[str] = None
+    TWITTER_API_SECRET: Optional[str] = None
+    TWITTER_ACCESS_TOKEN: Optional[str] = None
+    TWITTER_ACCESS_TOKEN_SECRET: Optional[str] = None
+    TWITTER_BEARER_TOKEN: Optional[str] = None
+
+    # Gemini API Configuration
+    GEMINI_API_KEY: Optional[str] = None
+
+    # Reddit API Configuration
+    REDDIT_CLIENT_ID: Optional[str] = None
+    REDDIT_CLIENT_SECRET: Optional[str] = None
+    REDDIT_USER_AGENT: Optional[str] = "MirrorTrendingAnalyzer/1.0"
+
 
     
     # Data Analysis Configuration
     MAX_REPOS_PER_TOPIC: int = 20
+
+    # Response Cache Configuration
+    REDIS_URL: Optional[str] = None
+    CACHE_TTL: int = 600  # seconds
+
+    # Search Micro-batching Configuration
+    BATCH_WINDOW_MS: int = 75
+    MAX_BATCH: int = 20
+
+    # Semantic Cache Configuration
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.85
     
     class Config:
         env_file = ".env"
         case_sensitive = False
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Parse .env/environment once per process"""
+    return Settings()
+
 # Create settings instance
-settings = Settings()
+settings = get_settings()
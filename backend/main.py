@@ -1,33 +1,94 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+from contextlib import asynccontextmanager
+from pathlib import Path
+import hashlib
+import logging
+import logging.handlers
+import queue
 import uvicorn
-from dotenv import load_dotenv
-import os
 
-from api.routes import trending_router
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+
+from api.routes import trending_router, limiter
 from core.config import settings
+from services.trending_analyzer import TrendingAnalyzer
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared service singletons once per process"""
+    # Route service log records through a queue: request handlers only
+    # enqueue, and a background listener thread does the formatting and
+    # stderr I/O, so a burst of warnings can't serialize the workers
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    listener.start()
+    root_logger = logging.getLogger()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    if root_logger.level == logging.NOTSET:
+        root_logger.setLevel(logging.WARNING)
+    app.state.log_listener = listener
+
+    # The analyzer owns the pooled HTTP clients and caches; building it
+    # here (not per request) keeps TCP/TLS connections warm across calls
+    app.state.analyzer = TrendingAnalyzer()
 
-# Load environment variables
-load_dotenv()
+    # Load the frontend entry point into memory once; hash it for ETag
+    # revalidation so repeat visitors get 304s with zero disk I/O
+    try:
+        app.state.index_html = Path("frontend/build/index.html").read_bytes()
+    except FileNotFoundError:
+        app.state.index_html = _FALLBACK_HTML.encode()
+    app.state.index_etag = hashlib.blake2b(app.state.index_html, digest_size=16).hexdigest()
+
+    yield
+    app.state.analyzer.close()
+    await app.state.analyzer.github_service.http.aclose()
+    app.state.log_listener.stop()
 
 # Create FastAPI app
 app = FastAPI(
     title="Mirror - Trending Topics Analyzer",
     description="Analyze trending topics across GitHub, X (Twitter), and Reddit",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Add CORS middleware
+# Per-IP rate limiting: heavy endpoints return a cheap 429 before any
+# GitHub quota is spent
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+# Add CORS middleware - an explicit origin/method/header list keeps GETs
+# preflight-free, and max_age lets browsers reuse preflights for a day
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify your frontend domain
+    allow_origins=[settings.FRONTEND_ORIGIN],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["authorization", "content-type", "if-none-match"],
+    max_age=86400,
 )
 
+# Compress large repo-list payloads. BrotliMiddleware gzips for clients
+# without br support (gzip_fallback defaults to True), so it fully
+# replaces GZipMiddleware - stacking both would gzip the brotli bytes a
+# second time and corrupt the response for br-capable clients.
+if BrotliMiddleware:
+    app.add_middleware(BrotliMiddleware, quality=4, minimum_size=1024)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Include routers
 app.include_router(trending_router, prefix="/api/v1")
 
@@ -37,14 +98,7 @@ try:
 except RuntimeError:
     print("Warning: Frontend static files not found. Run 'npm run build' in frontend directory to serve the web interface.")
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Serve the main application"""
-    try:
-        with open("frontend/build/index.html", "r") as f:
-            return HTMLResponse(content=f.read())
-    except FileNotFoundError:
-        return HTMLResponse(content="""
+_FALLBACK_HTML = """
         <!DOCTYPE html>
         <html>
         <head>
@@ -100,17 +154,39 @@ async def root():
             </div>
         </body>
         </html>
-        """)
+        """
+
+@app.get("/", response_class=HTMLResponse)
+async def root(request: Request):
+    """Serve the main application"""
+    # index.html is read once at startup; revalidations answer 304 with no body
+    if request.headers.get("if-none-match") == app.state.index_etag:
+        return Response(status_code=304)
+
+    return Response(
+        content=app.state.index_html,
+        media_type="text/html",
+        headers={
+            "ETag": app.state.index_etag,
+            "Cache-Control": "public, max-age=60"
+        }
+    )
+
+# Precomputed health response (constant, so build it once at import time)
+_HEALTH_RESPONSE = {"status": "healthy", "service": "Mirror API"}
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "Mirror API"}
+    return _HEALTH_RESPONSE
 
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.DEBUG
+        reload=settings.DEBUG,
+        loop="uvloop",
+        http="httptools",
+        workers=settings.WORKERS
     )
@@ -1,12 +1,17 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import FrozenSet, List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
 
 class PlatformType(str, Enum):
     GITHUB = "github"
+    TWITTER = "twitter"
+    REDDIT = "reddit"
 
 class GitHubRepo(BaseModel):
+    # Immutable after construction; unknown API fields are dropped at parse time
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     name: str
     full_name: str
     description: Optional[str]
@@ -28,19 +33,94 @@ class GitHubRepo(BaseModel):
 
 
 
+class TwitterPost(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    id: str
+    text: str
+    author_id: str
+    author_username: str
+    created_at: datetime
+    retweet_count: int
+    like_count: int
+    reply_count: int
+    quote_count: int
+    hashtags: List[str]
+    mentions: List[str]
+
+class RedditPost(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    id: str
+    title: str
+    selftext: str
+    author: str
+    subreddit: str
+    score: int
+    upvote_ratio: float
+    num_comments: int
+    created_utc: datetime
+    url: str
+    is_self: bool
+    domain: str
+
 class TrendingTopic(BaseModel):
     topic: str
     query: str
     platforms: List[PlatformType]
     github_data: Optional[List[GitHubRepo]] = []
+    twitter_data: Optional[List[TwitterPost]] = []
+    reddit_data: Optional[List[RedditPost]] = []
     analysis_timestamp: datetime = Field(default_factory=datetime.utcnow)
     overall_score: Optional[float] = None
 
 class TrendingAnalysisRequest(BaseModel):
     query: str = Field(..., description="Search query for trending topics")
-    platforms: List[PlatformType] = Field(default=[PlatformType.GITHUB])
+    # Frozenset dedupes platforms and gives O(1) membership checks
+    platforms: FrozenSet[PlatformType] = Field(default=frozenset({PlatformType.GITHUB}))
     max_results_per_platform: int = Field(default=20, ge=1, le=100)
 
+    @field_validator("query")
+    @classmethod
+    def _query_nonempty(cls, v: str) -> str:
+        v = v.strip()
+        if not v:
+            raise ValueError("Query cannot be empty")
+        return v
+
+    @field_validator("platforms")
+    @classmethod
+    def _platforms_nonempty(cls, v):
+        if not v:
+            raise ValueError("At least one platform must be selected")
+        return v
+
+class QuickAnalysisRequest(BaseModel):
+    query: str = Field(..., min_length=1)
+    platforms: FrozenSet[PlatformType] = Field(default=frozenset({PlatformType.GITHUB}))
+
+    # Same rules as TrendingAnalysisRequest, so bad input is rejected
+    # with a 422 at parse time instead of blowing up in the handler when
+    # the quick request is converted into a full analysis request
+    @field_validator("query")
+    @classmethod
+    def _query_nonempty(cls, v: str) -> str:
+        v = v.strip()
+        if not v:
+            raise ValueError("Query cannot be empty")
+        return v
+
+    @field_validator("platforms")
+    @classmethod
+    def _platforms_nonempty(cls, v):
+        if not v:
+            raise ValueError("At least one platform must be selected")
+        return v
+
+class NlpSearchRequest(BaseModel):
+    natural_query: str = Field(..., min_length=1)
+    max_results: int = Field(default=20, ge=1, le=100)
+
 class TrendingAnalysisResponse(BaseModel):
     success: bool
     message: str
@@ -48,6 +128,8 @@ class TrendingAnalysisResponse(BaseModel):
     error: Optional[str] = None
 
 class PlatformStats(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     platform: PlatformType
     total_items: int
     top_languages: List[Dict[str, Any]] = []
@@ -55,6 +137,8 @@ class PlatformStats(BaseModel):
     trending_keywords: List[str] = []
 
 class AnalysisSummary(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     total_repos: int
     top_languages: List[Dict[str, Any]]
     top_contributors: List[Dict[str, Any]]
@@ -0,0 +1,119 @@
+import asyncio
+from typing import Optional
+
+from core.config import settings
+
+
+class SearchBatcher:
+    """Coalesce concurrent searches into fewer upstream GitHub calls
+
+    Requests arriving within the batching window are collected off an
+    asyncio.Queue, grouped by identical (query, max_results), and each
+    group is served by a single upstream call whose result fans back out
+    to every waiter.
+    """
+
+    def __init__(self, search_fn, window_ms: Optional[int] = None, max_batch: Optional[int] = None):
+        self.search_fn = search_fn
+        self.window = (window_ms or settings.BATCH_WINDOW_MS) / 1000.0
+        self.max_batch = max_batch or settings.MAX_BATCH
+        self._queue = asyncio.Queue()
+        self._worker = None
+
+    async def search(self, query: str, max_results: int):
+        """Enqueue a search and wait for its (possibly shared) result"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, max_results, future))
+
+        # Lazily start a drain task; it exits once the queue is empty
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain())
+
+        return await future
+
+    async def _drain(self):
+        """Collect requests for one window, then dispatch grouped calls"""
+        while not self._queue.empty():
+            await asyncio.sleep(self.window)
+
+            pending = []
+            while not self._queue.empty() and len(pending) < self.max_batch:
+                pending.append(self._queue.get_nowait())
+
+            # One upstream call per distinct (query, max_results); the
+            # groups run concurrently - coalescing identical queries must
+            # not serialize different ones behind each other
+            groups = {}
+            for query, max_results, future in pending:
+                groups.setdefault((query, max_results), []).append(future)
+
+            await asyncio.gather(*(
+                self._dispatch(query, max_results, futures)
+                for (query, max_results), futures in groups.items()
+            ))
+
+    async def _dispatch(self, query: str, max_results: int, futures: list):
+        """Serve one group with a single upstream call, fanning out the result"""
+        try:
+            result = await self.search_fn(query, max_results)
+            for future in futures:
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+
+
+class ExpandBatcher:
+    """Coalesce concurrent query expansions into fewer Gemini calls
+
+    Expansions arriving within the batching window go out as a single
+    multi-query prompt; the per-query results fan back out to every
+    waiter. Identical queries in a window share one slot.
+    """
+
+    def __init__(self, expand_batch_fn, window_ms: Optional[int] = None, max_batch: Optional[int] = None):
+        self.expand_batch_fn = expand_batch_fn
+        self.window = (window_ms or settings.BATCH_WINDOW_MS) / 1000.0
+        self.max_batch = max_batch or settings.MAX_BATCH
+        self._queue = asyncio.Queue()
+        self._worker = None
+
+    async def expand(self, query: str) -> str:
+        """Enqueue an expansion and wait for its (possibly shared) result"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, future))
+
+        # Lazily start a drain task; it exits once the queue is empty
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain())
+
+        return await future
+
+    async def _drain(self):
+        """Collect expansions for one window, then dispatch one batched call"""
+        while not self._queue.empty():
+            await asyncio.sleep(self.window)
+
+            pending = []
+            while not self._queue.empty() and len(pending) < self.max_batch:
+                pending.append(self._queue.get_nowait())
+
+            groups = {}
+            for query, future in pending:
+                groups.setdefault(query, []).append(future)
+
+            try:
+                results = await self.expand_batch_fn(list(groups))
+                for query, futures in groups.items():
+                    # Fall back to the raw query if its line went missing
+                    result = results.get(query, query)
+                    for future in futures:
+                        if not future.done():
+                            future.set_result(result)
+            except Exception as e:
+                for futures in groups.values():
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e)
@@ -0,0 +1,117 @@
+import json
+import logging
+import time
+import hashlib
+
+import orjson
+from collections import OrderedDict
+from typing import Optional
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(**parts) -> str:
+    """Build a stable cache key from keyword parts"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Response cache backed by Redis with an in-process LRU fallback"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.redis = None
+        self.max_entries = max_entries
+        self._local = OrderedDict()  # key -> (expires_at, value)
+
+        if aioredis and settings.REDIS_URL:
+            try:
+                self.redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+            except Exception as e:
+                logger.warning("Error connecting to Redis, using in-process cache: %s", e)
+
+    async def get(self, key: str) -> Optional[str]:
+        """Get a cached value, or None on miss/expiry"""
+        if self.redis:
+            try:
+                return await self.redis.get(key)
+            except Exception as e:
+                logger.warning("Error reading from Redis cache: %s", e)
+
+        entry = self._local.get(key)
+        if entry:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._local.move_to_end(key)
+                return value
+            del self._local[key]
+        return None
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None):
+        """Store a value with a TTL (defaults to settings.CACHE_TTL)"""
+        ttl = ttl or settings.CACHE_TTL
+
+        if self.redis:
+            try:
+                await self.redis.set(key, value, ex=ttl)
+                return
+            except Exception as e:
+                logger.warning("Error writing to Redis cache: %s", e)
+
+        self._local[key] = (time.monotonic() + ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+
+class ConditionalGetClient:
+    """ETag-aware GET wrapper for the GitHub API
+
+    Stores (etag, body) per URL+params and sends If-None-Match on repeat
+    calls; a 304 reuses the cached body and does not count against the
+    GitHub rate limit.
+    """
+
+    def __init__(self, cache: ResponseCache):
+        self.cache = cache
+        self.stats = {"etag_304": 0, "misses": 0}
+
+    async def get(self, http, url: str, params: Optional[dict] = None) -> dict:
+        """GET a JSON resource, revalidating with If-None-Match when possible"""
+        key = "etag:" + make_cache_key(url=url, params=params)
+
+        headers = {}
+        cached_body = None
+        prior = await self.cache.get(key)
+        if prior:
+            entry = orjson.loads(prior)
+            headers["If-None-Match"] = entry["etag"]
+            cached_body = entry["body"]
+
+        response = await http.get(url, params=params, headers=headers)
+
+        if response.status_code == 304 and cached_body is not None:
+            self.stats["etag_304"] += 1
+            return orjson.loads(cached_body)
+
+        response.raise_for_status()
+        self.stats["misses"] += 1
+
+        etag = response.headers.get("ETag")
+        if etag:
+            await self.cache.set(
+                key,
+                orjson.dumps({"etag": etag, "body": response.text}).decode(),
+                ttl=86400
+            )
+
+        # orjson decodes response bytes directly, skipping the extra
+        # str round-trip of response.json()
+        return orjson.loads(response.content)
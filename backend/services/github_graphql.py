@@ -0,0 +1,121 @@
+from typing import List
+from datetime import datetime
+import httpx
+import logging
+import orjson
+
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
+from models.trending import GitHubRepo
+
+logger = logging.getLogger(__name__)
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+
+def parse_iso8601(value: str) -> datetime:
+    """Parse a GitHub ISO-8601 timestamp (C parser when available)
+
+    ciso8601 accepts the trailing 'Z' natively, skipping the per-value
+    .replace() allocation the stdlib path needs.
+    """
+    if ciso8601:
+        return ciso8601.parse_datetime(value)
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+# One search call returns repos plus the enrichment fields (topics,
+# commit and contributor counts) that previously cost 3-4 REST
+# round-trips per repository
+_SEARCH_REPOS_QUERY = """
+query($searchQuery: String!, $first: Int!) {
+  search(type: REPOSITORY, query: $searchQuery, first: $first) {
+    nodes {
+      ... on Repository {
+        name
+        nameWithOwner
+        description
+        url
+        stargazerCount
+        forkCount
+        primaryLanguage { name }
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        createdAt
+        updatedAt
+        issues(states: OPEN) { totalCount }
+        defaultBranchRef {
+          target { ... on Commit { history(first: 0) { totalCount } } }
+        }
+        mentionableUsers { totalCount }
+      }
+    }
+  }
+}
+"""
+
+
+def _parse_repo_node(node: dict) -> GitHubRepo:
+    """Convert a GraphQL repository node into a GitHubRepo model"""
+    topics = [t['topic']['name'] for t in node['repositoryTopics']['nodes']]
+    language = node['primaryLanguage']['name'] if node['primaryLanguage'] else None
+
+    commits_count = None
+    branch_ref = node.get('defaultBranchRef')
+    if branch_ref and branch_ref.get('target'):
+        commits_count = branch_ref['target'].get('history', {}).get('totalCount')
+
+    tech_stack = []
+    if language:
+        tech_stack.append(language)
+    tech_stack.extend(topics)
+
+    return GitHubRepo(
+        name=node['name'],
+        full_name=node['nameWithOwner'],
+        description=node.get('description'),
+        html_url=node['url'],
+        stargazers_count=node['stargazerCount'],
+        forks_count=node['forkCount'],
+        language=language,
+        topics=topics,
+        created_at=parse_iso8601(node['createdAt']),
+        updated_at=parse_iso8601(node['updatedAt']),
+        open_issues_count=node['issues']['totalCount'],
+        contributors_count=node['mentionableUsers']['totalCount'],
+        commits_count=commits_count,
+        tech_stack=tech_stack
+    )
+
+
+async def search_repos_graphql(http: httpx.AsyncClient, query: str, max_results: int) -> List[GitHubRepo]:
+    """Search and enrich up to max_results repositories in a single GraphQL call"""
+    response = await http.post(
+        GITHUB_GRAPHQL_URL,
+        json={
+            "query": _SEARCH_REPOS_QUERY,
+            "variables": {
+                "searchQuery": f"{query} sort:stars-desc",
+                "first": min(max_results, 100)
+            }
+        }
+    )
+    response.raise_for_status()
+
+    payload = orjson.loads(response.content)
+    if payload.get("errors"):
+        raise RuntimeError(f"GitHub GraphQL errors: {payload['errors']}")
+
+    repos = []
+    nodes = (payload.get('data') or {}).get('search', {}).get('nodes', [])
+    for node in nodes:
+        if not node:
+            continue
+        try:
+            repos.append(_parse_repo_node(node))
+        except Exception as e:
+            logger.warning("Error parsing GraphQL repo node: %s", e)
+            continue
+
+    return repos
@@ -1,53 +1,174 @@
-import github3
-from typing import List, Optional, Dict, Any
-import requests
-from datetime import datetime
-import time
+from typing import AsyncIterator, List, Optional, Dict, Any
+import httpx
+import asyncio
+import orjson
+import re
+from collections import defaultdict
+from datetime import datetime, timezone
+from heapq import nlargest
+from pydantic import TypeAdapter
 from core.config import settings
 from services.nlp_parser import NLPQueryParser, ParsedQuery
 from models.trending import GitHubRepo
 from services.nlp_services import SemanticSearch
+from services.github_graphql import search_repos_graphql, parse_iso8601
+from services.cache import ResponseCache, ConditionalGetClient, make_cache_key
+from services.batcher import SearchBatcher
+from services.rate_limiter import RateLimiter
+
+# Built once: pydantic-core (de)serializes whole repo lists in C
+_REPO_LIST_ADAPTER = TypeAdapter(List[GitHubRepo])
+
+# Last-page number in GitHub's pagination Link header, e.g.
+# <https://api.github.com/...&page=347>; rel="last"
+_LAST_PAGE_PATTERN = re.compile(r'[?&]page=(\d+)>; rel="last"')
 
 
 class GitHubService:
     def __init__(self):
         self.token = settings.GITHUB_TOKEN
-        self.github = None
         self.nlp_services = SemanticSearch()   # ✅ initialize NLP service
-        if self.token:
-            self.github = github3.login(token=self.token)
+        # Parser setup (pattern compilation, model loading) happens once
+        # per process instead of once per search
+        self.nlp_parser = NLPQueryParser()
 
-    def search_trending_repos(self, query: str, max_results: int = 20) -> List[GitHubRepo]:
+        # Shared async client: HTTP/2 multiplexing + connection pooling so
+        # GitHub calls reuse TCP/TLS sessions instead of reconnecting
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        # http2/limits must live on the transport: when transport= is
+        # given, httpx uses it as-is and ignores the client-level kwargs
+        self.http = httpx.AsyncClient(
+            timeout=10.0,
+            headers=headers,
+            transport=httpx.AsyncHTTPTransport(
+                retries=3,
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        )
+        # ETag revalidation: 304s reuse cached bodies without spending rate limit
+        self.cond_http = ConditionalGetClient(ResponseCache())
+        # TTL cache for search results and per-repo enrichment; backed by
+        # Redis when configured so workers share hits, else in-process LRU
+        self.cache = ResponseCache()
+        # Paces REST calls off GitHub's rate-limit headers instead of a
+        # fixed sleep; backs off on secondary-limit 403/429s
+        self.rate_limiter = RateLimiter()
+        # Coalesce overlapping NLP searches into shared upstream calls
+        self.batcher = SearchBatcher(self.search_trending_repos)
+
+    async def search_trending_repos(self, query: str, max_results: int = 20) -> List[GitHubRepo]:
         """Search for trending repositories based on query"""
         try:
-            if not self.github:
-                # Fallback to unauthenticated requests
-                return self._search_repos_unauthenticated(query, max_results)
+            # Repeated trending queries hit the cache instead of GitHub
+            cache_key = make_cache_key(
+                endpoint="github-search", query=query, max_results=max_results
+            )
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return _REPO_LIST_ADAPTER.validate_json(cached)
 
-            # Search repositories
-            search_query = f"{query}"
-            repos = self.github.search_repositories(search_query, sort='stars', order='desc')
+            repos = await self._search_repos(query, max_results)
+            if repos:
+                await self.cache.set(cache_key, _REPO_LIST_ADAPTER.dump_json(repos).decode())
+            return repos
 
-            repo_list = []
-            for repo in repos:
-                if len(repo_list) >= max_results:
-                    break
+        except Exception as e:
+            print(f"Error searching GitHub repos: {e}")
+            return []
+
+    async def _search_repos(self, query: str, max_results: int) -> List[GitHubRepo]:
+        """Dispatch a search to the cheapest available upstream path"""
+        if not self.token:
+            # Fallback to unauthenticated requests
+            return await self._search_repos_unauthenticated(query, max_results)
+
+        # One GraphQL call fetches search results plus enrichment fields,
+        # replacing N REST calls per repo
+        try:
+            repos = await search_repos_graphql(self.http, query, max_results)
+            now = datetime.now(timezone.utc)
+            return [self.compute_repo_metrics(repo, now=now) for repo in repos]
+        except Exception as e:
+            print(f"Error in GraphQL search, falling back to REST: {e}")
+
+        return await self._search_repos_authenticated(query, max_results)
 
+    async def iter_trending_repos(self, query: str, max_results: int = 20) -> AsyncIterator[GitHubRepo]:
+        """Stream trending repositories instead of returning a full batch
+
+        The REST enrichment path yields each repo as its enrichment
+        finishes (completion order, not stars order), so streaming
+        callers see the first repo after one round-trip rather than
+        after the slowest of the batch. The GraphQL and unauthenticated
+        paths arrive as complete batches and are yielded through.
+        """
+        if self.token:
+            try:
+                repos = await search_repos_graphql(self.http, query, max_results)
+                now = datetime.now(timezone.utc)
+                for repo in repos:
+                    yield self.compute_repo_metrics(repo, now=now)
+                return
+            except Exception as e:
+                print(f"Error in GraphQL search, falling back to REST: {e}")
+
+            items = await self._search_rest_items(query, max_results)
+            semaphore = asyncio.Semaphore(8)
+            now = datetime.now(timezone.utc)
+            tasks = [
+                asyncio.ensure_future(self._enrich_repo_data(item, semaphore))
+                for item in items
+            ]
+            for future in asyncio.as_completed(tasks):
                 try:
-                    # Get additional repository information
-                    repo_data = self._enrich_repo_data(repo)
-                    repo_with_metrics = self.compute_repo_metrics(repo_data)
-                    repo_list.append(repo_with_metrics)
-                    time.sleep(0.1)  # Rate limiting
+                    repo = await future
                 except Exception as e:
-                    print(f"Error enriching repo {repo.full_name}: {e}")
+                    print(f"Error enriching repo: {e}")
                     continue
+                yield self.compute_repo_metrics(repo, now=now)
+            return
+
+        for repo in await self._search_repos_unauthenticated(query, max_results):
+            yield repo
+
+    async def _search_rest_items(self, query: str, max_results: int) -> List[dict]:
+        """Fetch raw search items from the REST search endpoint"""
+        url = "https://api.github.com/search/repositories"
+        params = {
+            'q': f"{query}",
+            'sort': 'stars',
+            'order': 'desc',
+            'per_page': min(max_results, 100)
+        }
+
+        await self.rate_limiter.acquire()
+        data = await self.cond_http.get(self.http, url, params=params)
+        return data.get('items', [])[:max_results]
+
+    async def _search_repos_authenticated(self, query: str, max_results: int) -> List[GitHubRepo]:
+        """Search repositories over REST and enrich them concurrently"""
+        items = await self._search_rest_items(query, max_results)
+
+        # Bound enrichment fan-out so N repos overlap without hammering
+        # the API from every connection in the pool at once
+        semaphore = asyncio.Semaphore(8)
+        enriched = await asyncio.gather(
+            *(self._enrich_repo_data(item, semaphore) for item in items),
+            return_exceptions=True
+        )
 
-            return repo_list
+        repo_list = []
+        now = datetime.now(timezone.utc)
+        for item, result in zip(items, enriched):
+            if isinstance(result, Exception):
+                print(f"Error enriching repo {item.get('full_name')}: {result}")
+                continue
+            repo_list.append(self.compute_repo_metrics(result, now=now))
 
-        except Exception as e:
-            print(f"Error searching GitHub repos: {e}")
-            return []
+        return repo_list
 
     async def _search_repos_unauthenticated(self, query: str, max_results: int) -> List[GitHubRepo]:
         """Search repositories without authentication (limited)"""
@@ -60,11 +181,9 @@ class GitHubService:
                 'per_page': min(max_results, 30)  # GitHub API limit for unauthenticated
             }
 
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-
-            data = response.json()
+            data = await self.cond_http.get(self.http, url, params=params)
             repo_list = []
+            now = datetime.now(timezone.utc)
 
             for repo_data in data.get('items', []):
                 repo = GitHubRepo(
@@ -76,14 +195,14 @@ class GitHubService:
                     forks_count=repo_data['forks_count'],
                     language=repo_data.get('language'),
                     topics=repo_data.get('topics', []),
-                    created_at=datetime.fromisoformat(repo_data['created_at'].replace('Z', '+00:00')),
-                    updated_at=datetime.fromisoformat(repo_data['updated_at'].replace('Z', '+00:00')),
+                    created_at=parse_iso8601(repo_data['created_at']),
+                    updated_at=parse_iso8601(repo_data['updated_at']),
                     open_issues_count=repo_data['open_issues_count'],
                     contributors_count=None,
                     commits_count=None,
                     tech_stack=[]
                 )
-                repo_with_metrics = self.compute_repo_metrics(repo)
+                repo_with_metrics = self.compute_repo_metrics(repo, now=now)
                 repo_list.append(repo_with_metrics)
 
             return repo_list
@@ -92,165 +211,198 @@ class GitHubService:
             print(f"Error in unauthenticated GitHub search: {e}")
             return []
 
-    def compute_repo_metrics(self, repo: GitHubRepo) -> GitHubRepo:
-        """Enhance repo with extra metrics like stars/day, health score"""
+    def compute_repo_metrics(self, repo: GitHubRepo, now: Optional[datetime] = None) -> GitHubRepo:
+        """Enhance repo with extra metrics like stars/day, health score
+
+        Batch callers pass a shared `now` so the clock is read once per
+        batch rather than twice per repo.
+        """
         try:
+            if now is None:
+                now = datetime.now(timezone.utc)
+
             # Stars per day
-            days_old = max((datetime.utcnow() - repo.created_at).days, 1)
-            repo.stars_per_day = repo.stargazers_count / days_old
+            days_old = max((now - repo.created_at).days, 1)
+            stars_per_day = repo.stargazers_count / days_old
 
             # Stars per contributor
+            stars_per_contributor = None
             if repo.contributors_count:
-                repo.stars_per_contributor = repo.stargazers_count / repo.contributors_count
+                stars_per_contributor = repo.stargazers_count / repo.contributors_count
 
             # Health score (example formula)
-            activity_score = 1 / max((datetime.utcnow() - repo.updated_at).days, 1)
+            activity_score = 1 / max((now - repo.updated_at).days, 1)
             issue_penalty = repo.open_issues_count / max(repo.stargazers_count + repo.forks_count, 1)
 
-            repo.health_score = (
+            health_score = (
                 repo.stargazers_count * 0.6 +
                 repo.forks_count * 0.3 +
                 activity_score * 100 -
                 issue_penalty * 50
             )
 
+            # GitHubRepo is frozen, so derive an updated copy
+            return repo.model_copy(update={
+                'stars_per_day': stars_per_day,
+                'stars_per_contributor': stars_per_contributor,
+                'health_score': health_score
+            })
+
         except Exception as e:
             print(f"Error computing metrics for {repo.full_name}: {e}")
 
         return repo
 
-    def _enrich_repo_data(self, repo) -> GitHubRepo:
-        """Enrich repository data with additional information"""
-        try:
+    async def _enrich_repo_data(self, repo_data: dict, semaphore: asyncio.Semaphore) -> GitHubRepo:
+        """Enrich one search result with topics and activity counts"""
+        full_name = repo_data['full_name']
+        base_url = f"https://api.github.com/repos/{full_name}"
+
+        # Keyed on updated_at so a pushed repo naturally invalidates its entry
+        cache_key = make_cache_key(
+            endpoint="github-enrich", repo=full_name, updated_at=repo_data.get('updated_at')
+        )
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return GitHubRepo.model_validate_json(cached)
+
+        async with semaphore:
             # Get topics
-            topics = []
-            try:
-                topics = [topic.name for topic in repo.topics()]
-            except:
-                pass
+            topics = repo_data.get('topics', [])
+            if not topics:
+                try:
+                    await self.rate_limiter.acquire()
+                    data = await self.cond_http.get(self.http, f"{base_url}/topics")
+                    topics = data.get('names', [])
+                except Exception:
+                    topics = []
 
             # Get contributors count
             contributors_count = None
             try:
-                contributors = repo.contributors()
-                contributors_count = len(list(contributors))
-            except:
+                contributors_count = await self._count_via_link_header(
+                    f"{base_url}/contributors", params={'per_page': 1, 'anon': 'true'}
+                )
+            except Exception:
                 pass
 
-            # Get commits count (approximate)
+            # Get commits count
             commits_count = None
             try:
-                commits = repo.commits()
-                commits_count = len(list(commits))
-            except:
+                commits_count = await self._count_via_link_header(
+                    f"{base_url}/commits", params={'per_page': 1}
+                )
+            except Exception:
                 pass
 
-            # Determine tech stack from language and topics
-            tech_stack = []
-            if repo.language:
-                tech_stack.append(repo.language)
-            tech_stack.extend(topics)
-
-            return GitHubRepo(
-                name=repo.name,
-                full_name=repo.full_name,
-                description=repo.description,
-                html_url=repo.html_url,
-                stargazers_count=repo.stargazers_count,
-                forks_count=repo.forks_count,
-                language=repo.language,
-                topics=topics,
-                created_at=repo.created_at,
-                updated_at=repo.updated_at,
-                open_issues_count=repo.open_issues_count,
-                contributors_count=contributors_count,
-                commits_count=commits_count,
-                tech_stack=tech_stack
-            )
+        # Determine tech stack from language and topics
+        language = repo_data.get('language')
+        tech_stack = []
+        if language:
+            tech_stack.append(language)
+        tech_stack.extend(topics)
+
+        repo = GitHubRepo(
+            name=repo_data['name'],
+            full_name=full_name,
+            description=repo_data.get('description'),
+            html_url=repo_data['html_url'],
+            stargazers_count=repo_data['stargazers_count'],
+            forks_count=repo_data['forks_count'],
+            language=language,
+            topics=topics,
+            created_at=parse_iso8601(repo_data['created_at']),
+            updated_at=parse_iso8601(repo_data['updated_at']),
+            open_issues_count=repo_data['open_issues_count'],
+            contributors_count=contributors_count,
+            commits_count=commits_count,
+            tech_stack=tech_stack
+        )
+        await self.cache.set(cache_key, repo.model_dump_json())
+        return repo
 
-        except Exception as e:
-            print(f"Error enriching repo data: {e}")
-            raise
+    async def _count_via_link_header(self, url: str, params: dict) -> int:
+        """Count a paginated collection without materializing it
+
+        With per_page=1 the last-page number in the Link header *is* the
+        item count, so one request replaces walking every page.
+        """
+        response = await self.rate_limiter.get(self.http, url, params=params)
+        response.raise_for_status()
+
+        match = _LAST_PAGE_PATTERN.search(response.headers.get('Link', ''))
+        if match:
+            return int(match.group(1))
+
+        # No Link header means everything fit on this single page
+        return len(orjson.loads(response.content))
 
     def get_trending_languages(self, repos: List[GitHubRepo]) -> List[Dict[str, Any]]:
         """Analyze trending programming languages from repositories"""
-        language_stats = {}
+        # [count, total_stars, total_forks] per language
+        language_stats = defaultdict(lambda: [0, 0, 0])
 
         for repo in repos:
             if repo.language:
-                if repo.language not in language_stats:
-                    language_stats[repo.language] = {
-                        'count': 0,
-                        'total_stars': 0,
-                        'total_forks': 0
-                    }
-
-                language_stats[repo.language]['count'] += 1
-                language_stats[repo.language]['total_stars'] += repo.stargazers_count
-                language_stats[repo.language]['total_forks'] += repo.forks_count
-
-        # Sort by count and then by total stars
-        sorted_languages = sorted(
+                stats = language_stats[repo.language]
+                stats[0] += 1
+                stats[1] += repo.stargazers_count
+                stats[2] += repo.forks_count
+
+        # Top 10 by count then total stars: O(N log 10) instead of a full sort
+        top_languages = nlargest(
+            10,
             language_stats.items(),
-            key=lambda x: (x[1]['count'], x[1]['total_stars']),
-            reverse=True
+            key=lambda item: (item[1][0], item[1][1])
         )
 
         return [
             {
                 'language': lang,
-                'count': stats['count'],
-                'total_stars': stats['total_stars'],
-                'total_forks': stats['total_forks'],
-                'avg_stars': stats['total_stars'] / stats['count']
+                'count': count,
+                'total_stars': total_stars,
+                'total_forks': total_forks,
+                'avg_stars': total_stars / count
             }
-            for lang, stats in sorted_languages[:10]  # Top 10 languages
+            for lang, (count, total_stars, total_forks) in top_languages
         ]
 
     def get_top_contributors(self, repos: List[GitHubRepo]) -> List[Dict[str, Any]]:
         """Get top contributors based on repository activity"""
-        contributor_stats = {}
-
-        for repo in repos:
-            if repo.contributors_count:
-                # Simple scoring based on repository popularity
-                score = repo.stargazers_count + repo.forks_count * 2
-
-                if repo.full_name not in contributor_stats:
-                    contributor_stats[repo.full_name] = {
-                        'repo_name': repo.full_name,
-                        'score': score,
-                        'stars': repo.stargazers_count,
-                        'forks': repo.forks_count,
-                        'language': repo.language
-                    }
-
-        # Sort by score
-        sorted_contributors = sorted(
-            contributor_stats.values(),
-            key=lambda x: x['score'],
-            reverse=True
+        # Simple scoring based on repository popularity; repo lists are
+        # already deduplicated by full_name upstream
+        top_repos = nlargest(
+            10,
+            (repo for repo in repos if repo.contributors_count),
+            key=lambda repo: repo.stargazers_count + repo.forks_count * 2
         )
 
-        return sorted_contributors[:10]  # Top 10 contributors
+        return [
+            {
+                'repo_name': repo.full_name,
+                'score': repo.stargazers_count + repo.forks_count * 2,
+                'stars': repo.stargazers_count,
+                'forks': repo.forks_count,
+                'language': repo.language
+            }
+            for repo in top_repos
+        ]
 
-    def search_with_nlp(self, natural_query: str, max_results: int = 20) -> Dict[str, Any]:
+    async def search_with_nlp(self, natural_query: str, max_results: int = 20) -> Dict[str, Any]:
         """Search repositories using natural language processing"""
         try:
-            # Initialize NLP parser
-            nlp_parser = NLPQueryParser()
-            
             # Parse the natural language query
-            parsed_query = nlp_parser.parse_query(natural_query)
-            
+            parsed_query = self.nlp_parser.parse_query(natural_query)
+
             # Build GitHub search query
-            github_query = nlp_parser.build_github_query(parsed_query)
-            
+            github_query = self.nlp_parser.build_github_query(parsed_query)
+
             # Get query explanation
-            explanation = nlp_parser.get_query_explanation(parsed_query)
+            explanation = self.nlp_parser.get_query_explanation(parsed_query)
             
-            # Perform the search
-            repos = self.search_trending_repos(github_query, max_results)
+            # Perform the search through the micro-batcher so concurrent
+            # requests that parse to the same GitHub query share one call
+            repos = await self.batcher.search(github_query, max_results)
             
             return {
                 "repositories": repos,
@@ -270,35 +422,44 @@ class GitHubService:
                 "parsed_filters": {}
             }
 
+    # Canned suggestions per trigger keyword, built once at class definition
+    _MCP_SUGGESTIONS = [
+        "mcp server implementation",
+        "model context protocol tools",
+        "mcp client libraries",
+        "mcp integration examples"
+    ]
+    _SUGGEST_MAP = {
+        "mcp": _MCP_SUGGESTIONS,
+        "model context protocol": _MCP_SUGGESTIONS,
+        "notion": [
+            "notion api integration",
+            "notion database sync",
+            "notion automation tools",
+            "notion webhook handlers"
+        ]
+    }
+    _STARRED_SUGGESTIONS = [
+        "highly starred repositories",
+        "popular open source projects",
+        "trending repositories",
+        "well-maintained projects"
+    ]
+
     def get_semantic_search_suggestions(self, query: str) -> List[str]:
         """Get semantic search suggestions based on the query"""
+        # Lowercase once; each branch was re-lowering the query before
+        q = query.lower()
         suggestions = []
-        
+
         # Common patterns for different types of searches
-        if "mcp" in query.lower() or "model context protocol" in query.lower():
-            suggestions.extend([
-                "mcp server implementation",
-                "model context protocol tools",
-                "mcp client libraries",
-                "mcp integration examples"
-            ])
-        
-        if "notion" in query.lower():
-            suggestions.extend([
-                "notion api integration",
-                "notion database sync",
-                "notion automation tools",
-                "notion webhook handlers"
-            ])
-        
-        if "100" in query and "stars" in query.lower():
-            suggestions.extend([
-                "highly starred repositories",
-                "popular open source projects",
-                "trending repositories",
-                "well-maintained projects"
-            ])
-        
+        for keyword, canned in self._SUGGEST_MAP.items():
+            if keyword in q:
+                suggestions.extend(canned)
+
+        if "100" in q and "stars" in q:
+            suggestions.extend(self._STARRED_SUGGESTIONS)
+
         # Add generic suggestions
         suggestions.extend([
             f"repositories about {query}",
@@ -306,5 +467,6 @@ class GitHubService:
             f"libraries related to {query}",
             f"frameworks for {query}"
         ])
-        
-        return list(set(suggestions))[:5]  # Return unique suggestions, max 5
+
+        # dict.fromkeys dedupes in O(N) while keeping insertion order
+        return list(dict.fromkeys(suggestions))[:5]
@@ -1,22 +1,9 @@
 import re
-import spacy
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-import nltk
-from textblob import TextBlob
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-@dataclass
+@dataclass(slots=True)
 class ParsedQuery:
     """Structured representation of a parsed natural language query"""
     base_query: str
@@ -43,243 +30,229 @@ class ParsedQuery:
         if self.search_in is None:
             self.search_in = ['name', 'description', 'readme', 'topics']
 
+# Parsing regexes, compiled once at import time instead of per query
+# One scan extracts every numeric constraint ("more than 100 stars",
+# "50+ forks", "10 contributors or more") instead of 15 pattern probes
+_NUMERIC_CONSTRAINT_RE = re.compile(
+    r'(?:(?:more than|at least|minimum)\s+)?'
+    r'(?P<n>\d+)\s*\+?\s*'
+    r'(?P<kind>stars?|forks?|contributors?)'
+    r'(?:\s*or more)?'
+)
+
+_LANGUAGE_PATTERNS = [re.compile(p) for p in (
+    r'in (\w+)',
+    r'(\w+) projects?',
+    r'(\w+) repositories?',
+    r'(\w+) code',
+    r'(\w+) language'
+)]
+
+_DATE_PATTERNS = [re.compile(p) for p in (
+    r'created (?:in|after|since) (\d{4})',
+    r'created (?:in|after|since) (\w+ \d{4})',
+    r'updated (?:in|after|since) (\d{4})',
+    r'updated (?:in|after|since) (\w+ \d{4})',
+    r'from (\d{4})',
+    r'since (\d{4})'
+)]
+
+_TOPIC_PATTERNS = [re.compile(p) for p in (
+    r'with (\w+(?:-\w+)*)',
+    r'using (\w+(?:-\w+)*)',
+    r'(\w+(?:-\w+)*) integration',
+    r'(\w+(?:-\w+)*) support',
+    r'(\w+(?:-\w+)*) plugin'
+)]
+
+# Structured phrases removed when deriving the base query, ordered
+# most-specific first so e.g. "at least N stars" wins over "N stars"
+_BASE_QUERY_PATTERNS = (
+    r'(?:more than|at least|minimum) \d+\s*stars?',
+    r'\d+\s*stars? or more',
+    r'\d+\s*\+?\s*stars?',
+    r'(?:more than|at least|minimum) \d+\s*forks?',
+    r'\d+\s*forks? or more',
+    r'\d+\s*\+?\s*forks?',
+    r'(?:more than|at least|minimum) \d+\s*contributors?',
+    r'\d+\s*contributors? or more',
+    r'\d+\s*\+?\s*contributors?',
+    r'(?:created|updated) (?:in|after|since) (?:\w+ )?\d{4}',
+    r'(?:from|since) \d{4}',
+    r'in \w+',
+    r'\w+ (?:projects?|repositories?|code|language)',
+    r'(?:with|using) \w+(?:-\w+)*',
+    r'\w+(?:-\w+)* (?:integration|support|plugin)',
+    r'with(?:out)? issues?',
+    r'with(?:out)? wiki',
+    r'not archived',
+    r'archived',
+    r'not forked',
+    r'forked',
+    r'original',
+)
+
+# One alternation pass over the query instead of ~40 sequential re.sub
+# scans that each traverse the full string
+_BASE_QUERY_UNION = re.compile('|'.join(f'(?:{p})' for p in _BASE_QUERY_PATTERNS))
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_NOISE_EDGE_RE = re.compile(
+    r'^(?:repos?|repositories?|projects?|code)\s+'
+    r'|\s+(?:repos?|repositories?|projects?|code)$'
+)
+
+_YEAR_RE = re.compile(r'\d{4}')
+_MONTH_YEAR_RE = re.compile(r'\w+ \d{4}')
+
+# Map common language variations to GitHub's canonical names
+_LANG_MAP = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'rb': 'ruby',
+    'php': 'php',
+    'java': 'java',
+    'cpp': 'c++',
+    'csharp': 'c#',
+    'go': 'go',
+    'rust': 'rust',
+    'swift': 'swift',
+    'kotlin': 'kotlin',
+    'scala': 'scala'
+}
+
+_MONTH_MAP = {
+    'jan': '01', 'feb': '02', 'mar': '03', 'apr': '04',
+    'may': '05', 'jun': '06', 'jul': '07', 'aug': '08',
+    'sep': '09', 'oct': '10', 'nov': '11', 'dec': '12'
+}
+
+# Literal tokens whose absence lets parse_query skip an extractor group
+_DATE_KEYWORDS = ('created', 'updated', 'from', 'since')
+_TOPIC_KEYWORDS = ('with ', 'using ', 'integration', 'support', 'plugin')
+_BOOLEAN_KEYWORDS = ('issue', 'wiki', 'archiv', 'fork', 'original')
+
+# Every boolean trigger is a literal phrase, so plain substring checks
+# replace the regex engine; negated phrases come later and override
+_BOOLEAN_PHRASES = [
+    ('with issue', 'has_issues', True),
+    ('without issue', 'has_issues', False),
+    ('with wiki', 'has_wiki', True),
+    ('without wiki', 'has_wiki', False),
+    ('archived', 'is_archived', True),
+    ('not archived', 'is_archived', False),
+    ('forked', 'is_fork', True),
+    ('not forked', 'is_fork', False),
+    ('original', 'is_fork', False)
+]
+
 class NLPQueryParser:
     """Parse natural language queries into structured GitHub search parameters"""
-    
+
     def __init__(self):
-        # Load spaCy model (use smaller model for faster processing)
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            # If model not available, use basic text processing
-            self.nlp = None
-            print("Warning: spaCy model not available. Using basic text processing.")
-        
-        # Common patterns for GitHub search
-        self.star_patterns = [
-            r'more than (\d+)\s*stars?',
-            r'(\d+)\s*\+?\s*stars?',
-            r'at least (\d+)\s*stars?',
-            r'minimum (\d+)\s*stars?',
-            r'(\d+)\s*stars? or more'
-        ]
-        
-        self.fork_patterns = [
-            r'more than (\d+)\s*forks?',
-            r'(\d+)\s*\+?\s*forks?',
-            r'at least (\d+)\s*forks?',
-            r'minimum (\d+)\s*forks?',
-            r'(\d+)\s*forks? or more'
-        ]
-        
-        self.contributor_patterns = [
-            r'more than (\d+)\s*contributors?',
-            r'(\d+)\s*\+?\s*contributors?',
-            r'at least (\d+)\s*contributors?',
-            r'minimum (\d+)\s*contributors?',
-            r'(\d+)\s*contributors? or more'
-        ]
-        
-        self.language_patterns = [
-            r'in (\w+)',
-            r'(\w+) projects?',
-            r'(\w+) repositories?',
-            r'(\w+) code',
-            r'(\w+) language'
-        ]
-        
-        self.date_patterns = [
-            r'created (?:in|after|since) (\d{4})',
-            r'created (?:in|after|since) (\w+ \d{4})',
-            r'updated (?:in|after|since) (\d{4})',
-            r'updated (?:in|after|since) (\w+ \d{4})',
-            r'from (\d{4})',
-            r'since (\d{4})'
-        ]
-        
-        self.topic_patterns = [
-            r'with (\w+(?:-\w+)*)',
-            r'using (\w+(?:-\w+)*)',
-            r'(\w+(?:-\w+)*) integration',
-            r'(\w+(?:-\w+)*) support',
-            r'(\w+(?:-\w+)*) plugin'
-        ]
-        
-        self.boolean_patterns = [
-            (r'with issues?', 'has_issues', True),
-            (r'without issues?', 'has_issues', False),
-            (r'with wiki', 'has_wiki', True),
-            (r'without wiki', 'has_wiki', False),
-            (r'archived', 'is_archived', True),
-            (r'not archived', 'is_archived', False),
-            (r'forked', 'is_fork', True),
-            (r'not forked', 'is_fork', False),
-            (r'original', 'is_fork', False)
-        ]
+        # Shared precompiled patterns for GitHub search
+        self.language_patterns = _LANGUAGE_PATTERNS
+        self.date_patterns = _DATE_PATTERNS
+        self.topic_patterns = _TOPIC_PATTERNS
+        self.boolean_phrases = _BOOLEAN_PHRASES
+
+        # Parsing is a pure function of the query string and queries
+        # recur heavily (autocomplete, re-runs), so memoize per instance
+        self._cached_parse = lru_cache(maxsize=1024)(self._parse_query_uncached)
 
     def parse_query(self, query: str) -> ParsedQuery:
         """Parse natural language query into structured parameters"""
-        query = query.lower().strip()
-        
+        return self._cached_parse(query.lower().strip())
+
+    def _parse_query_uncached(self, query: str) -> ParsedQuery:
+        """Run the full extractor pipeline (cache-miss path)"""
+
         # Initialize parsed query
         parsed = ParsedQuery(base_query=query)
-        
+
         # Extract base query (remove all the structured parts)
         base_query = self._extract_base_query(query)
         parsed.base_query = base_query
-        
-        # Extract numeric constraints
-        parsed.min_stars = self._extract_min_stars(query)
-        parsed.min_forks = self._extract_min_forks(query)
-        parsed.min_contributors = self._extract_min_contributors(query)
-        
+
+        # Cheap C-level substring probes gate the extractor groups, so
+        # queries without a constraint type skip its regex scans entirely
+        if 'star' in query or 'fork' in query or 'contributor' in query:
+            # Extract numeric constraints in one scan
+            numeric = self._extract_numeric_constraints(query)
+            parsed.min_stars = numeric.get('star')
+            parsed.min_forks = numeric.get('fork')
+            parsed.min_contributors = numeric.get('contributor')
+
         # Extract language
         parsed.language = self._extract_language(query)
-        
+
         # Extract dates
-        parsed.created_after = self._extract_created_date(query)
-        parsed.updated_after = self._extract_updated_date(query)
-        
+        if any(k in query for k in _DATE_KEYWORDS):
+            parsed.created_after = self._extract_created_date(query)
+            parsed.updated_after = self._extract_updated_date(query)
+
         # Extract topics
-        parsed.topics = self._extract_topics(query)
-        
+        if any(k in query for k in _TOPIC_KEYWORDS):
+            parsed.topics = self._extract_topics(query)
+
         # Extract boolean flags
-        for pattern, field, value in self.boolean_patterns:
-            if re.search(pattern, query):
-                setattr(parsed, field, value)
-        
+        if any(k in query for k in _BOOLEAN_KEYWORDS):
+            for phrase, field, value in self.boolean_phrases:
+                if phrase in query:
+                    setattr(parsed, field, value)
+
         # Extract search scope
-        parsed.search_in = self._extract_search_scope(query)
-        
+        if 'only' in query:
+            parsed.search_in = self._extract_search_scope(query)
+
         return parsed
     
     def _extract_base_query(self, query: str) -> str:
         """Extract the main search query by removing structured parts"""
         # Remove all the pattern matches to get the base query
-        query = re.sub(r'more than \d+\s*stars?', '', query)
-        query = re.sub(r'\d+\s*\+?\s*stars?', '', query)
-        query = re.sub(r'at least \d+\s*stars?', '', query)
-        query = re.sub(r'minimum \d+\s*stars?', '', query)
-        query = re.sub(r'\d+\s*stars? or more', '', query)
-        
-        query = re.sub(r'more than \d+\s*forks?', '', query)
-        query = re.sub(r'\d+\s*\+?\s*forks?', '', query)
-        query = re.sub(r'at least \d+\s*forks?', '', query)
-        query = re.sub(r'minimum \d+\s*forks?', '', query)
-        query = re.sub(r'\d+\s*forks? or more', '', query)
-        
-        query = re.sub(r'more than \d+\s*contributors?', '', query)
-        query = re.sub(r'\d+\s*\+?\s*contributors?', '', query)
-        query = re.sub(r'at least \d+\s*contributors?', '', query)
-        query = re.sub(r'minimum \d+\s*contributors?', '', query)
-        query = re.sub(r'\d+\s*contributors? or more', '', query)
-        
-        query = re.sub(r'in \w+', '', query)
-        query = re.sub(r'\w+ projects?', '', query)
-        query = re.sub(r'\w+ repositories?', '', query)
-        query = re.sub(r'\w+ code', '', query)
-        query = re.sub(r'\w+ language', '', query)
-        
-        query = re.sub(r'created (?:in|after|since) \d{4}', '', query)
-        query = re.sub(r'created (?:in|after|since) \w+ \d{4}', '', query)
-        query = re.sub(r'updated (?:in|after|since) \d{4}', '', query)
-        query = re.sub(r'updated (?:in|after|since) \w+ \d{4}', '', query)
-        query = re.sub(r'from \d{4}', '', query)
-        query = re.sub(r'since \d{4}', '', query)
-        
-        query = re.sub(r'with \w+(?:-\w+)*', '', query)
-        query = re.sub(r'using \w+(?:-\w+)*', '', query)
-        query = re.sub(r'\w+(?:-\w+)* integration', '', query)
-        query = re.sub(r'\w+(?:-\w+)* support', '', query)
-        query = re.sub(r'\w+(?:-\w+)* plugin', '', query)
-        
-        query = re.sub(r'with issues?', '', query)
-        query = re.sub(r'without issues?', '', query)
-        query = re.sub(r'with wiki', '', query)
-        query = re.sub(r'without wiki', '', query)
-        query = re.sub(r'archived', '', query)
-        query = re.sub(r'not archived', '', query)
-        query = re.sub(r'forked', '', query)
-        query = re.sub(r'not forked', '', query)
-        query = re.sub(r'original', '', query)
-        
+        query = _BASE_QUERY_UNION.sub('', query)
+
         # Clean up extra whitespace and common words
-        query = re.sub(r'\s+', ' ', query).strip()
-        query = re.sub(r'^(repos?|repositories?|projects?|code)\s+', '', query)
-        query = re.sub(r'\s+(repos?|repositories?|projects?|code)$', '', query)
-        
+        query = _WHITESPACE_RE.sub(' ', query).strip()
+        query = _NOISE_EDGE_RE.sub('', query)
+
         return query.strip()
     
-    def _extract_min_stars(self, query: str) -> Optional[int]:
-        """Extract minimum stars requirement"""
-        for pattern in self.star_patterns:
-            match = re.search(pattern, query)
-            if match:
-                return int(match.group(1))
-        return None
-    
-    def _extract_min_forks(self, query: str) -> Optional[int]:
-        """Extract minimum forks requirement"""
-        for pattern in self.fork_patterns:
-            match = re.search(pattern, query)
-            if match:
-                return int(match.group(1))
-        return None
-    
-    def _extract_min_contributors(self, query: str) -> Optional[int]:
-        """Extract minimum contributors requirement"""
-        for pattern in self.contributor_patterns:
-            match = re.search(pattern, query)
-            if match:
-                return int(match.group(1))
-        return None
-    
+    def _extract_numeric_constraints(self, query: str) -> Dict[str, int]:
+        """Extract star/fork/contributor minimums in a single pass"""
+        constraints = {}
+        for match in _NUMERIC_CONSTRAINT_RE.finditer(query):
+            kind = match['kind'].rstrip('s')
+            # First mention wins, matching the old per-pattern behavior
+            constraints.setdefault(kind, int(match['n']))
+        return constraints
+
+
     def _extract_language(self, query: str) -> Optional[str]:
         """Extract programming language"""
         for pattern in self.language_patterns:
-            match = re.search(pattern, query)
+            match = pattern.search(query)
             if match:
                 lang = match.group(1).lower()
-                # Map common language variations
-                lang_map = {
-                    'js': 'javascript',
-                    'ts': 'typescript',
-                    'py': 'python',
-                    'rb': 'ruby',
-                    'php': 'php',
-                    'java': 'java',
-                    'cpp': 'c++',
-                    'csharp': 'c#',
-                    'go': 'go',
-                    'rust': 'rust',
-                    'swift': 'swift',
-                    'kotlin': 'kotlin',
-                    'scala': 'scala'
-                }
-                return lang_map.get(lang, lang)
+                return _LANG_MAP.get(lang, lang)
         return None
     
     def _extract_created_date(self, query: str) -> Optional[str]:
         """Extract creation date constraint"""
         for pattern in self.date_patterns:
-            match = re.search(pattern, query)
+            match = pattern.search(query)
             if match:
                 date_str = match.group(1)
                 # Convert to GitHub date format
-                if re.match(r'\d{4}', date_str):
+                if _YEAR_RE.match(date_str):
                     return f"{date_str}-01-01"
                 # Handle month-year format
-                elif re.match(r'\w+ \d{4}', date_str):
-                    # Simple month parsing
-                    month_map = {
-                        'jan': '01', 'feb': '02', 'mar': '03', 'apr': '04',
-                        'may': '05', 'jun': '06', 'jul': '07', 'aug': '08',
-                        'sep': '09', 'oct': '10', 'nov': '11', 'dec': '12'
-                    }
+                elif _MONTH_YEAR_RE.match(date_str):
                     parts = date_str.split()
                     if len(parts) == 2:
                         month, year = parts
-                        month_num = month_map.get(month[:3].lower(), '01')
+                        month_num = _MONTH_MAP.get(month[:3].lower(), '01')
                         return f"{year}-{month_num}-01"
         return None
     
@@ -292,7 +265,7 @@ class NLPQueryParser:
         """Extract topics/technologies mentioned"""
         topics = []
         for pattern in self.topic_patterns:
-            matches = re.findall(pattern, query)
+            matches = pattern.findall(query)
             for match in matches:
                 if match not in topics:
                     topics.append(match)
@@ -313,56 +286,52 @@ class NLPQueryParser:
         
         return scope
     
+    # Value-carrying filters: (ParsedQuery attribute, qualifier prefix).
+    # Truthy check matches the old branches (a 0 minimum is skipped).
+    _GITHUB_FILTER_SPECS = (
+        ('language', 'language:'),
+        ('min_stars', 'stars:>='),
+        ('max_stars', 'stars:<='),
+        ('min_forks', 'forks:>='),
+        ('max_forks', 'forks:<='),
+        ('min_contributors', 'contributors:>='),
+        ('max_contributors', 'contributors:<='),
+        ('created_after', 'created:>='),
+        ('updated_after', 'pushed:>='),
+    )
+
+    # Tri-state boolean filters: (attribute, qualifier if True, if False)
+    _GITHUB_BOOL_SPECS = (
+        ('has_issues', 'has:issues', 'no:issues'),
+        ('has_wiki', 'has:wiki', 'no:wiki'),
+        ('is_archived', 'archived:true', 'archived:false'),
+        ('is_fork', 'fork:true', 'fork:false'),
+    )
+
     def build_github_query(self, parsed: ParsedQuery) -> str:
         """Build GitHub search query from parsed parameters"""
         query_parts = []
-        
+
         # Add base query
         if parsed.base_query:
             query_parts.append(parsed.base_query)
-        
-        # Add language filter
-        if parsed.language:
-            query_parts.append(f"language:{parsed.language}")
-        
-        # Add star filters
-        if parsed.min_stars:
-            query_parts.append(f"stars:>={parsed.min_stars}")
-        if parsed.max_stars:
-            query_parts.append(f"stars:<={parsed.max_stars}")
-        
-        # Add fork filters
-        if parsed.min_forks:
-            query_parts.append(f"forks:>={parsed.min_forks}")
-        if parsed.max_forks:
-            query_parts.append(f"forks:<={parsed.max_forks}")
-        
-        # Add contributor filters
-        if parsed.min_contributors:
-            query_parts.append(f"contributors:>={parsed.min_contributors}")
-        if parsed.max_contributors:
-            query_parts.append(f"contributors:<={parsed.max_contributors}")
-        
-        # Add date filters
-        if parsed.created_after:
-            query_parts.append(f"created:>={parsed.created_after}")
-        if parsed.updated_after:
-            query_parts.append(f"pushed:>={parsed.updated_after}")
-        
+
+        # Add value-carrying filters
+        query_parts.extend(
+            f"{prefix}{value}"
+            for attr, prefix in self._GITHUB_FILTER_SPECS
+            if (value := getattr(parsed, attr))
+        )
+
         # Add boolean filters
-        if parsed.has_issues is not None:
-            query_parts.append(f"has:issues" if parsed.has_issues else "no:issues")
-        if parsed.has_wiki is not None:
-            query_parts.append(f"has:wiki" if parsed.has_wiki else "no:wiki")
-        if parsed.is_archived is not None:
-            query_parts.append(f"archived:{'true' if parsed.is_archived else 'false'}")
-        if parsed.is_fork is not None:
-            query_parts.append(f"fork:{'true' if parsed.is_fork else 'false'}")
-        
+        for attr, when_true, when_false in self._GITHUB_BOOL_SPECS:
+            value = getattr(parsed, attr)
+            if value is not None:
+                query_parts.append(when_true if value else when_false)
+
         # Add topic filters
-        for topic in parsed.topics:
-            query_parts.append(f"topic:{topic}")
-        
+        query_parts.extend(f"topic:{topic}" for topic in parsed.topics)
+
         return " ".join(query_parts)
     
     def get_query_explanation(self, parsed: ParsedQuery) -> Dict[str, any]:
@@ -1,19 +1,101 @@
 # services/semantic_search.py
-import os
+import asyncio
+import re
+from typing import Dict, List, Optional
+
 import google.generativeai as genai
-from dotenv import load_dotenv
 
-load_dotenv()
+from core.config import settings
+
+# Strips "1." / "2)" style prefixes from batched expansion output lines
+_NUMBERED_LINE_RE = re.compile(r'^\s*\d+\s*[.)]\s*')
 
 class SemanticSearch:
+    # Bound so a long-running worker can't grow the cache without limit
+    _CACHE_MAX_ENTRIES = 1024
+
     def __init__(self):
-        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        genai.configure(api_key=settings.GEMINI_API_KEY)
         self.model = genai.GenerativeModel("gemini-2.5-pro")
+        # Expansion is ~1s and billed per call; repeated queries come
+        # out of this cache instead. The lock keeps concurrent misses
+        # for the same query from racing.
+        self._cache = {}
+        self._cache_lock = asyncio.Lock()
+
+    def get_cached(self, user_query: str) -> Optional[str]:
+        """Return the cached expansion, or None on a miss"""
+        return self._cache.get(user_query.lower().strip())
 
     async def expand_query(self, user_query: str) -> str:
         """
         Convert natural user query into GitHub-friendly keywords.
         """
+        cached = self.get_cached(user_query)
+        if cached is not None:
+            return cached
+
+        expanded = await self._expand_uncached(user_query)
+        await self._cache_put(user_query, expanded)
+        return expanded
+
+    async def expand_queries_batch(self, user_queries: List[str]) -> Dict[str, str]:
+        """
+        Expand several queries with one Gemini call (batched prompt).
+
+        Returns a mapping of original query -> expanded keywords. Cached
+        queries are answered from the cache and excluded from the prompt.
+        """
+        results: Dict[str, str] = {}
+        missing = []
+        for query in user_queries:
+            cached = self.get_cached(query)
+            if cached is not None:
+                results[query] = cached
+            else:
+                missing.append(query)
+
+        if not missing:
+            return results
+        if len(missing) == 1:
+            # No batching win for a single miss - reuse the tuned prompt
+            results[missing[0]] = await self.expand_query(missing[0])
+            return results
+
+        numbered = "\n".join(f"{i + 1}. {query}" for i, query in enumerate(missing))
+        prompt = f"""
+        Convert each of the following user requests into optimized GitHub
+        search keywords. Answer with one numbered line per request, in the
+        same order. Keep each line short, only space-separated keywords,
+        no stopwords, no explanations.
+
+        Requests:
+        {numbered}
+
+        Output:
+        """
+
+        response = await self.model.generate_content_async(prompt)
+        lines = [line for line in response.text.strip().splitlines() if line.strip()]
+
+        for query, line in zip(missing, lines):
+            expanded = _NUMBERED_LINE_RE.sub('', line).strip()
+            if expanded:
+                results[query] = expanded
+                await self._cache_put(query, expanded)
+
+        return results
+
+    async def _cache_put(self, user_query: str, expanded: str):
+        """Insert an expansion, evicting the oldest entry when full"""
+        async with self._cache_lock:
+            if len(self._cache) >= self._CACHE_MAX_ENTRIES:
+                # Evict the oldest entry (dicts keep insertion order)
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[user_query.lower().strip()] = expanded
+
+    async def _expand_uncached(self, user_query: str) -> str:
+        """Ask Gemini for the keyword expansion (cache-miss path)"""
         prompt = f"""
         Convert the following user request into optimized GitHub search keywords.
         Keep the output short, only space-separated keywords,
@@ -30,5 +112,7 @@ class SemanticSearch:
         Output:
         """
 
-        response = self.model.generate_content(prompt)
+        # The SDK's native async call awaits on the event loop directly,
+        # with no worker thread in the middle
+        response = await self.model.generate_content_async(prompt)
         return response.text.strip()
@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import httpx
+
+# Exponential backoff schedule for secondary rate-limit (403/429) retries
+_BACKOFF_SCHEDULE = (1, 2, 4, 8, 16, 32)
+
+
+class RateLimiter:
+    """Adaptive pacing driven by GitHub's rate-limit response headers
+
+    Instead of a fixed inter-request sleep, this tracks
+    X-RateLimit-Remaining / X-RateLimit-Reset from every response and
+    only slows down when the quota actually runs low, spreading the
+    remaining budget across the time left until reset.
+    """
+
+    def __init__(self, min_remaining_buffer: int = 100):
+        self.remaining = None
+        self.reset_at = None
+        self.min_remaining_buffer = min_remaining_buffer
+        self._retry_at = 0.0
+
+    async def acquire(self):
+        """Wait if the quota is nearly exhausted or a Retry-After is pending"""
+        now = time.time()
+        if self._retry_at > now:
+            await asyncio.sleep(self._retry_at - now)
+            return
+
+        if (
+            self.remaining is not None
+            and self.reset_at is not None
+            and self.remaining < self.min_remaining_buffer
+            and self.reset_at > now
+        ):
+            # Spread what's left of the budget over the window until reset
+            await asyncio.sleep(min((self.reset_at - now) / max(self.remaining, 1), 60.0))
+
+    def update(self, headers):
+        """Record quota state from a response's rate-limit headers"""
+        try:
+            if 'X-RateLimit-Remaining' in headers:
+                self.remaining = int(headers['X-RateLimit-Remaining'])
+            if 'X-RateLimit-Reset' in headers:
+                self.reset_at = int(headers['X-RateLimit-Reset'])
+            if 'Retry-After' in headers:
+                self._retry_at = time.time() + int(headers['Retry-After'])
+        except (TypeError, ValueError):
+            pass
+
+    async def get(self, http: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+        """GET with quota-aware pacing and backoff on secondary rate limits"""
+        response = None
+        for backoff in _BACKOFF_SCHEDULE:
+            await self.acquire()
+            response = await http.get(url, **kwargs)
+            self.update(response.headers)
+
+            if response.status_code in (403, 429):
+                retry_after = response.headers.get('Retry-After')
+                await asyncio.sleep(int(retry_after) if retry_after else backoff)
+                continue
+
+            return response
+
+        return response
@@ -1,33 +1,79 @@
 import praw
+import numpy as np
 from typing import List, Optional, Dict, Any
 import re
-from datetime import datetime, timedelta
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from heapq import nlargest
 from core.config import settings
 from models.trending import RedditPost
 
+# Words of 4+ letters; the pattern already excludes digits/underscores,
+# so no per-word isalpha() check is needed
+_WORD_RE = re.compile(r'\b[a-zA-Z]{4,}\b')
+
+# Hostname from a post URL; cheaper than urlparse on the per-post path
+_DOMAIN_RE = re.compile(r'https?://([^/]+)')
+
+# Programming/tech subreddits searched for every trending query
+DEFAULT_SUBREDDITS = (
+    'programming', 'Python', 'javascript', 'webdev',
+    'MachineLearning', 'datascience', 'technology',
+    'coding', 'learnprogramming', 'opensource'
+)
+
+_STOPWORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have',
+    'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+    'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you',
+    'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them',
+    'my', 'your', 'his', 'its', 'our', 'their'
+})
+
 class RedditService:
     def __init__(self):
         self.reddit = None
+        self._subreddits = []
+        self._executor = None
         self._initialize_api()
-    
+
     def _initialize_api(self):
         """Initialize Reddit API client"""
         try:
-            if (settings.REDDIT_CLIENT_ID and 
-                settings.REDDIT_CLIENT_SECRET and 
+            if (settings.REDDIT_CLIENT_ID and
+                settings.REDDIT_CLIENT_SECRET and
                 settings.REDDIT_USER_AGENT):
-                
+
                 self.reddit = praw.Reddit(
                     client_id=settings.REDDIT_CLIENT_ID,
                     client_secret=settings.REDDIT_CLIENT_SECRET,
                     user_agent=settings.REDDIT_USER_AGENT
                 )
+                # Subreddit handles are lazy in PRAW; build them once so
+                # the per-request loop reuses objects instead of churning
+                self._subreddits = [
+                    self.reddit.subreddit(name) for name in DEFAULT_SUBREDDITS
+                ]
+                # One long-lived pool for the per-subreddit searches;
+                # threads are reused across requests instead of spawned
+                # and joined per call
+                self._executor = ThreadPoolExecutor(
+                    max_workers=len(self._subreddits),
+                    thread_name_prefix='reddit'
+                )
             else:
                 print("Warning: No Reddit API credentials provided")
                 
         except Exception as e:
             print(f"Error initializing Reddit API: {e}")
-    
+
+    def close(self):
+        """Release the worker threads (app shutdown hook)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
     def search_trending_posts(self, query: str, max_results: int = 50) -> List[RedditPost]:
         """Search for trending posts based on query"""
         try:
@@ -35,65 +81,75 @@ class RedditService:
                 return self._mock_reddit_data(query, max_results)
             
             posts = []
-            
-            # Search across multiple programming/tech subreddits
-            subreddits = [
-                'programming', 'Python', 'javascript', 'webdev', 
-                'MachineLearning', 'datascience', 'technology',
-                'coding', 'learnprogramming', 'opensource'
+
+            # One blocking round-trip per subreddit - run them in
+            # parallel instead of paying the RTTs back to back. PRAW is
+            # thread-safe for read-only use of one client instance.
+            per_sub_limit = min(20, max_results)
+            futures = [
+                self._executor.submit(self._search_one_subreddit, subreddit, query, per_sub_limit)
+                for subreddit in self._subreddits
             ]
-            
-            for subreddit_name in subreddits:
+            for future in as_completed(futures):
+                posts.extend(future.result())
                 if len(posts) >= max_results:
+                    # Enough posts - stop consuming. The stragglers run
+                    # out on the persistent pool without blocking this
+                    # request (there is no shutdown join here).
                     break
-                
-                try:
-                    subreddit = self.reddit.subreddit(subreddit_name)
-                    
-                    # Search for posts
-                    search_results = subreddit.search(
-                        query, 
-                        sort='hot', 
-                        time_filter='week',
-                        limit=min(20, max_results - len(posts))
-                    )
-                    
-                    for submission in search_results:
-                        if len(posts) >= max_results:
-                            break
-                        
-                        try:
-                            post = self._parse_submission(submission)
-                            if post:
-                                posts.append(post)
-                        except Exception as e:
-                            print(f"Error parsing submission: {e}")
-                            continue
-                            
-                except Exception as e:
-                    print(f"Error searching subreddit {subreddit_name}: {e}")
-                    continue
-            
+
             return posts[:max_results]
-            
+
         except Exception as e:
             print(f"Error searching Reddit posts: {e}")
             return self._mock_reddit_data(query, max_results)
+
+    def _search_one_subreddit(self, subreddit, query: str, limit: int) -> List[RedditPost]:
+        """Search a single subreddit (runs on a worker thread)"""
+        posts = []
+        try:
+            # Search for posts
+            search_results = subreddit.search(
+                query,
+                sort='hot',
+                time_filter='week',
+                limit=limit
+            )
+
+            for submission in search_results:
+                try:
+                    post = self._parse_submission(submission)
+                    if post:
+                        posts.append(post)
+                except Exception as e:
+                    print(f"Error parsing submission: {e}")
+                    continue
+
+        except Exception as e:
+            print(f"Error searching subreddit {subreddit}: {e}")
+
+        return posts
     
     def _parse_submission(self, submission) -> Optional[RedditPost]:
         """Parse Reddit submission into RedditPost model"""
         try:
-            # Extract domain from URL
-            domain = submission.domain if hasattr(submission, 'domain') else 'reddit.com'
-            
+            # getattr with a default is one lookup; the hasattr dance
+            # does the same attribute resolution twice
+            domain = getattr(submission, 'domain', None)
+            if not domain:
+                # Fall back to the link URL's hostname
+                match = _DOMAIN_RE.match(getattr(submission, 'url', '') or '')
+                domain = match.group(1) if match else 'reddit.com'
+
             # Determine if it's a self post
-            is_self = submission.is_self if hasattr(submission, 'is_self') else False
-            
+            is_self = getattr(submission, 'is_self', False)
+
             # Get selftext (content for self posts)
-            selftext = submission.selftext if hasattr(submission, 'selftext') else ""
-            
-            # Convert timestamp to datetime
-            created_time = datetime.fromtimestamp(submission.created_utc)
+            selftext = getattr(submission, 'selftext', "")
+
+            # Convert timestamp to datetime; created_utc is a UTC epoch,
+            # so parse it as UTC rather than host-local time
+            created_time = datetime.fromtimestamp(submission.created_utc, tz=timezone.utc)
             
             return RedditPost(
                 id=submission.id,
@@ -117,7 +173,7 @@ class RedditService:
     def _mock_reddit_data(self, query: str, max_results: int) -> List[RedditPost]:
         """Generate mock Reddit data for testing"""
         posts = []
-        base_time = datetime.utcnow()
+        base_time = datetime.now(timezone.utc)
         subreddits = ['programming', 'Python', 'javascript', 'webdev', 'technology']
         
         for i in range(min(max_results, 20)):
@@ -144,53 +200,66 @@ class RedditService:
         """Calculate community engagement metrics from posts"""
         if not posts:
             return {}
-        
-        # Subreddit statistics
-        subreddit_stats = {}
+
+        n = len(posts)
+
+        # Struct-of-arrays layout: pull the numeric columns out once so
+        # every aggregate below is a C-level array pass
+        scores = np.fromiter((p.score for p in posts), dtype=np.int64, count=n)
+        comments = np.fromiter((p.num_comments for p in posts), dtype=np.int64, count=n)
+        ratios = np.fromiter((p.upvote_ratio for p in posts), dtype=np.float64, count=n)
+        # Timestamps are UTC; datetime64 rejects tz-aware values, so drop
+        # the tzinfo right before conversion (np.datetime64('now') below
+        # is UTC too, keeping the comparison apples to apples)
+        created = np.array(
+            [p.created_utc.replace(tzinfo=None) for p in posts],
+            dtype='datetime64[s]'
+        )
+
+        # Time-window filters are array comparisons, not per-post
+        # datetime arithmetic
+        day_ago = np.datetime64('now') - np.timedelta64(24, 'h')
+
+        # Subreddit statistics in one pass: [count, score, comments, ratio]
+        per_subreddit = defaultdict(lambda: [0, 0, 0, 0.0])
         for post in posts:
-            subreddit = post.subreddit
-            if subreddit not in subreddit_stats:
-                subreddit_stats[subreddit] = {
-                    'count': 0,
-                    'total_score': 0,
-                    'total_comments': 0,
-                    'avg_upvote_ratio': 0.0
-                }
-            
-            subreddit_stats[subreddit]['count'] += 1
-            subreddit_stats[subreddit]['total_score'] += post.score
-            subreddit_stats[subreddit]['total_comments'] += post.num_comments
-            subreddit_stats[subreddit]['avg_upvote_ratio'] += post.upvote_ratio
-        
-        # Calculate averages
-        for subreddit in subreddit_stats:
-            count = subreddit_stats[subreddit]['count']
-            subreddit_stats[subreddit]['avg_score'] = subreddit_stats[subreddit]['total_score'] / count
-            subreddit_stats[subreddit]['avg_comments'] = subreddit_stats[subreddit]['total_comments'] / count
-            subreddit_stats[subreddit]['avg_upvote_ratio'] = subreddit_stats[subreddit]['avg_upvote_ratio'] / count
-        
-        # Overall metrics
-        total_score = sum(post.score for post in posts)
-        total_comments = sum(post.num_comments for post in posts)
-        avg_upvote_ratio = sum(post.upvote_ratio for post in posts) / len(posts)
-        
-        # Top performing posts
-        top_posts = sorted(posts, key=lambda x: x.score, reverse=True)[:5]
-        
+            stats = per_subreddit[post.subreddit]
+            stats[0] += 1
+            stats[1] += post.score
+            stats[2] += post.num_comments
+            stats[3] += post.upvote_ratio
+
+        subreddit_stats = {
+            subreddit: {
+                'count': count,
+                'total_score': total_score,
+                'total_comments': total_comments,
+                'avg_upvote_ratio': ratio_sum / count,
+                'avg_score': total_score / count,
+                'avg_comments': total_comments / count
+            }
+            for subreddit, (count, total_score, total_comments, ratio_sum)
+            in per_subreddit.items()
+        }
+
+        # Top performing posts: partial selection, then order just those 5
+        k = min(5, n)
+        top_idx = np.argpartition(-scores, k - 1)[:k]
+        top_idx = top_idx[np.argsort(-scores[top_idx])]
+        top_posts = [posts[i] for i in top_idx]
+
         # Most active subreddits
-        most_active_subreddits = sorted(
-            subreddit_stats.items(),
-            key=lambda x: x[1]['count'],
-            reverse=True
-        )[:5]
-        
+        most_active_subreddits = nlargest(
+            5, subreddit_stats.items(), key=lambda item: item[1]['count']
+        )
+
         return {
-            'total_posts': len(posts),
-            'total_score': total_score,
-            'total_comments': total_comments,
-            'avg_score_per_post': total_score / len(posts),
-            'avg_comments_per_post': total_comments / len(posts),
-            'avg_upvote_ratio': avg_upvote_ratio,
+            'total_posts': n,
+            'total_score': int(scores.sum()),
+            'total_comments': int(comments.sum()),
+            'avg_score_per_post': float(scores.mean()),
+            'avg_comments_per_post': float(comments.mean()),
+            'avg_upvote_ratio': float(ratios.mean()),
             'subreddit_stats': subreddit_stats,
             'top_posts': [
                 {
@@ -203,36 +272,28 @@ class RedditService:
             ],
             'most_active_subreddits': most_active_subreddits,
             'engagement_trend': {
-                'high_engagement_posts': len([p for p in posts if p.score > 100]),
-                'medium_engagement_posts': len([p for p in posts if 50 <= p.score <= 100]),
-                'low_engagement_posts': len([p for p in posts if p.score < 50])
+                'high_engagement_posts': int(np.count_nonzero(scores > 100)),
+                'medium_engagement_posts': int(np.count_nonzero((scores >= 50) & (scores <= 100))),
+                'low_engagement_posts': int(np.count_nonzero(scores < 50)),
+                'posts_last_24h': int(np.count_nonzero(created > day_ago))
             }
         }
     
     def get_trending_keywords(self, posts: List[RedditPost]) -> List[Dict[str, Any]]:
         """Extract trending keywords from post titles and content"""
-        keyword_counts = {}
-        
-        for post in posts:
-            # Combine title and selftext
-            text = f"{post.title} {post.selftext}".lower()
-            
-            # Extract words (simple approach)
-            words = re.findall(r'\b\w+\b', text)
-            
-            # Filter out common words and short words
-            common_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'her', 'its', 'our', 'their'}
-            
-            for word in words:
-                if len(word) > 3 and word not in common_words and word.isalpha():
-                    keyword_counts[word] = keyword_counts.get(word, 0) + 1
-        
-        # Sort by frequency
-        trending_keywords = sorted(
-            keyword_counts.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:15]  # Top 15 keywords
+        # Join all posts with a separator that can't appear inside a
+        # word, so lowercasing and tokenization each run exactly once
+        # instead of once per post
+        joined = '\x00'.join(f"{post.title} {post.selftext}" for post in posts).lower()
+
+        # Counter.update runs the counting loop in C
+        keyword_counts = Counter(
+            word for word in _WORD_RE.findall(joined)
+            if word not in _STOPWORDS
+        )
+
+        # Heap-based top-15: O(N log 15) instead of sorting every keyword
+        trending_keywords = keyword_counts.most_common(15)
         
         return [
             {
@@ -0,0 +1,28 @@
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _github_score(stars, forks, contributors) -> float:
+    """Weighted popularity score over the repo metric columns"""
+    n = stars.size
+    score = (stars.sum() / n) * 0.5 + (forks.sum() / n) * 0.3 + (contributors.sum() / n) * 0.2
+    return min(score / 1000.0, 100.0)
+
+
+def _reddit_score(scores, comments) -> float:
+    """Average activity score over the post metric columns"""
+    avg = (scores.sum() + comments.sum() * 2) / scores.size
+    return min(avg / 50.0, 100.0)
+
+
+# JIT-compile the kernels when Numba is installed (cache=True persists
+# the machine code across processes); the plain-NumPy versions above
+# compute identical results when it isn't
+if njit is not None:
+    github_score = njit(cache=True)(_github_score)
+    reddit_score = njit(cache=True)(_reddit_score)
+else:
+    github_score = _github_score
+    reddit_score = _reddit_score
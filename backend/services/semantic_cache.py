@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from typing import Any, Optional
+
+try:
+    from sentence_transformers import SentenceTransformer
+    import numpy as np
+    _IMPORT_ERROR = None
+except ImportError as e:
+    SentenceTransformer = None
+    np = None
+    _IMPORT_ERROR = e
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Reuse cached NLP search results for semantically similar queries"""
+
+    def __init__(self, max_entries: int = 256):
+        self.model = None
+        self.max_entries = max_entries
+        # namespace -> ([embeddings], [payloads]); endpoints store
+        # different payload shapes, so each gets its own entry space and
+        # a hit can never cross endpoints
+        self._entries = {}
+
+        if settings.SEMANTIC_CACHE_ENABLED:
+            if SentenceTransformer is None:
+                # Name the import failure instead of silently never
+                # activating a cache the operator asked for
+                logger.warning(
+                    "Semantic cache is enabled but sentence-transformers "
+                    "failed to import, so it stays disabled: %s", _IMPORT_ERROR
+                )
+            else:
+                try:
+                    self.model = SentenceTransformer("all-MiniLM-L6-v2")
+                except Exception as e:
+                    logger.warning("Error loading embedding model for semantic cache: %s", e)
+
+    def _embed(self, query: str):
+        """Embed and L2-normalize a query so dot product equals cosine similarity"""
+        vec = self.model.encode([query])[0]
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    async def get(self, query: str, namespace: str = "default") -> Optional[Any]:
+        """Return the cached payload of the most similar query, if close enough"""
+        entry = self._entries.get(namespace)
+        if not self.model or not entry:
+            return None
+
+        vectors, payloads = entry
+        try:
+            # Model inference runs on a worker thread so the event loop
+            # keeps serving other requests while we embed
+            vec = await asyncio.to_thread(self._embed, query)
+            scores = np.asarray(vectors) @ vec
+            best = int(scores.argmax())
+            if scores[best] >= settings.SEMANTIC_CACHE_THRESHOLD:
+                return payloads[best]
+        except Exception as e:
+            logger.warning("Error querying semantic cache: %s", e)
+        return None
+
+    async def add(self, query: str, payload: Any, namespace: str = "default"):
+        """Store a result under the query's embedding"""
+        if not self.model:
+            return
+
+        try:
+            vectors, payloads = self._entries.setdefault(namespace, ([], []))
+            vectors.append(await asyncio.to_thread(self._embed, query))
+            payloads.append(payload)
+            if len(vectors) > self.max_entries:
+                vectors.pop(0)
+                payloads.pop(0)
+        except Exception as e:
+            logger.warning("Error adding to semantic cache: %s", e)
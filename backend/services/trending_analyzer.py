@@ -1,20 +1,62 @@
-from typing import List, Dict, Any
+from typing import Awaitable, Callable, List, Dict, Any
 from datetime import datetime
 import asyncio
+import logging
 from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
+
 from models.trending import (
-    TrendingTopic, TrendingAnalysisRequest, 
+    TrendingTopic, TrendingAnalysisRequest,
     PlatformType, AnalysisSummary, PlatformStats
 )
 from services.github_service import GitHubService
+from services.twitter_service import TwitterService
+from services.reddit_service import RedditService
 from services.nlp_services import SemanticSearch   # 👈 added
+from services.batcher import ExpandBatcher
+from services import score_kernels
 from core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Per-platform collection deadline; a platform that blows it returns
+# empty rather than delaying the whole analysis
+_COLLECT_TIMEOUT_S = 5.0
+
 class TrendingAnalyzer:
+    # (weight, scorer, data attr) per platform; GitHub counts most.
+    # Weights renormalize over whichever platforms returned data, so a
+    # missing platform doesn't drag the score down.
+    _SCORE_WEIGHTS = (
+        (0.4, '_calculate_github_score', 'github_data'),
+        (0.35, '_calculate_twitter_score', 'twitter_data'),
+        (0.25, '_calculate_reddit_score', 'reddit_data'),
+    )
+
     def __init__(self):
         self.github_service = GitHubService()
+        self.twitter_service = TwitterService()
+        self.reddit_service = RedditService()
         self.semantic = SemanticSearch()   # 👈 init Gemini wrapper
+        # Concurrent requests share one batched Gemini expansion call
+        self._expand_batcher = ExpandBatcher(self.semantic.expand_queries_batch)
+        # One long-lived pool for the blocking SDK calls (tweepy/praw);
+        # threads are reused across requests instead of spawned per call
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='trending')
+        # Platform -> collector coroutine factory, built once; adding a
+        # platform means one entry here instead of another if-chain
+        self._collectors: Dict[PlatformType, Callable[[str, int], Awaitable[List]]] = {
+            PlatformType.GITHUB: self._collect_github_data,
+            PlatformType.TWITTER: self._collect_twitter_data,
+            PlatformType.REDDIT: self._collect_reddit_data,
+        }
+
+    def close(self):
+        """Release worker threads and pooled connections (app shutdown hook)"""
+        self._executor.shutdown(wait=False)
+        self.twitter_service.close()
+        self.reddit_service.close()
     
     async def analyze_trending_topic(self, request: TrendingAnalysisRequest) -> TrendingTopic:
         """Analyze trending topics across all specified platforms"""
@@ -29,103 +71,220 @@ class TrendingAnalyzer:
             
             # 🔹 Expand query with NLP (Gemini)
             try:
-                expanded_query = await self.semantic.expand_query(request.query)
+                # Cache hits skip the batching window entirely; misses
+                # get coalesced with other in-flight expansions
+                expanded_query = self.semantic.get_cached(request.query)
+                if expanded_query is None:
+                    expanded_query = await self._expand_batcher.expand(request.query)
             except Exception as e:
-                print(f"Error expanding query with NLP: {e}")
+                logger.warning("Error expanding query with NLP: %s", e)
                 expanded_query = request.query  # fallback
 
             trending_topic.query = expanded_query  # save expanded query
-            
-            # Collect GitHub data
-            if PlatformType.GITHUB in request.platforms:
-                try:
-                    github_data = await self._collect_github_data(expanded_query, request.max_results_per_platform)
-                    trending_topic.github_data = github_data
-                except Exception as e:
-                    print(f"Error collecting GitHub data: {e}")
-                    trending_topic.github_data = []
-            
+
+            # Collect platform data concurrently - wall-clock time becomes
+            # max(per-platform latency) instead of the sum. The dispatch
+            # table replaces the old per-platform membership checks.
+            coros = {
+                platform: self._collectors[platform](expanded_query, request.max_results_per_platform)
+                for platform in request.platforms
+                if platform in self._collectors
+            }
+
+            # Tasks are keyed by platform, so results land on the right
+            # field by name instead of positional zip-stitching. Each
+            # collector is guarded with its own timeout: one slow or
+            # failing platform returns [] without holding up the rest.
+            async with asyncio.TaskGroup() as tg:
+                tasks = {
+                    platform: tg.create_task(self._collect_guarded(platform, coro))
+                    for platform, coro in coros.items()
+                }
+
+            for platform, task in tasks.items():
+                setattr(trending_topic, f"{platform.value}_data", task.result())
+
             # Calculate overall score
             trending_topic.overall_score = self._calculate_overall_score(trending_topic)
             
             return trending_topic
             
         except Exception as e:
-            print(f"Error in trending analysis: {e}")
+            logger.warning("Error in trending analysis: %s", e)
             raise
     
+    async def _collect_guarded(self, platform: PlatformType, coro) -> List:
+        """Run one platform collector with a timeout; failures yield []"""
+        try:
+            return await asyncio.wait_for(coro, timeout=_COLLECT_TIMEOUT_S)
+        except Exception as e:
+            logger.warning("Error collecting %s data: %s", platform.value, e)
+            return []
+
     async def _collect_github_data(self, query: str, max_results: int) -> List:
         """Collect GitHub data asynchronously"""
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            return await loop.run_in_executor(
-                executor, 
-                self.github_service.search_trending_repos, 
-                query, 
-                max_results
-            )
-    
+        # Fully native async - httpx on the shared event loop, no threads
+        return await self.github_service.search_trending_repos(query, max_results)
+
+    async def _collect_twitter_data(self, query: str, max_results: int) -> List:
+        """Collect Twitter data asynchronously"""
+        # tweepy is a blocking SDK, so this still needs a worker thread -
+        # the analyzer's own pool, shared across requests
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            self.twitter_service.search_trending_posts,
+            query,
+            max_results
+        )
+
+    async def _collect_reddit_data(self, query: str, max_results: int) -> List:
+        """Collect Reddit data asynchronously"""
+        # praw is blocking as well; same shared-pool bridge
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            self.reddit_service.search_trending_posts,
+            query,
+            max_results
+        )
+
     def _calculate_overall_score(self, trending_topic: TrendingTopic) -> float:
-        """Calculate overall trending score based on GitHub data"""
-        if trending_topic.github_data:
-            return self._calculate_github_score(trending_topic.github_data)
-        return 0.0
-    
+        """Calculate the weighted trending score across populated platforms"""
+        total = weight_sum = 0.0
+        for weight, scorer, attr in self._SCORE_WEIGHTS:
+            data = getattr(trending_topic, attr)
+            if data:
+                total += getattr(self, scorer)(data) * weight
+                weight_sum += weight
+        return total / weight_sum if weight_sum else 0.0
+
     def _calculate_github_score(self, repos: List) -> float:
         """Calculate GitHub trending score"""
         if not repos:
             return 0.0
-        
-        total_stars = sum(repo.stargazers_count for repo in repos)
-        total_forks = sum(repo.forks_count for repo in repos)
-        total_contributors = sum(repo.contributors_count or 0 for repo in repos)
-        
-        # Normalize scores (rough estimates)
-        avg_stars = total_stars / len(repos)
-        avg_forks = total_forks / len(repos)
-        avg_contributors = total_contributors / len(repos)
-        
-        # Score based on popularity metrics
-        score = (avg_stars * 0.5) + (avg_forks * 0.3) + (avg_contributors * 0.2)
-        
+
+        # Struct-of-arrays: pull each metric column out once, then every
+        # reduction below is a C-level array pass instead of a Python
+        # attribute-lookup loop
+        n = len(repos)
+        stars = np.fromiter((r.stargazers_count for r in repos), dtype=np.int64, count=n)
+        forks = np.fromiter((r.forks_count for r in repos), dtype=np.int64, count=n)
+        contributors = np.fromiter((r.contributors_count or 0 for r in repos), dtype=np.int64, count=n)
+
+        # Weighted reduction in the (optionally JIT-compiled) kernel
+        return float(score_kernels.github_score(stars, forks, contributors))
+
+    def _calculate_twitter_score(self, posts: List) -> float:
+        """Calculate Twitter trending score"""
+        if not posts:
+            return 0.0
+
+        # get_engagement_metrics memoizes per batch, so the summary
+        # generator reuses this aggregation instead of re-summing
+        metrics = self.twitter_service.get_engagement_metrics(posts)
+
         # Normalize to 0-100 scale
-        return min(score / 1000, 100.0)
-    
+        return float(min(metrics['avg_engagement_per_post'] / 100, 100.0))
+
+    def _calculate_reddit_score(self, posts: List) -> float:
+        """Calculate Reddit trending score"""
+        if not posts:
+            return 0.0
+
+        n = len(posts)
+        scores = np.fromiter((p.score for p in posts), dtype=np.int64, count=n)
+        comments = np.fromiter((p.num_comments for p in posts), dtype=np.int64, count=n)
+
+        return float(score_kernels.reddit_score(scores, comments))
+
     def generate_analysis_summary(self, trending_topic: TrendingTopic) -> AnalysisSummary:
         """Generate comprehensive analysis summary"""
-        summary = AnalysisSummary(
-            total_repos=len(trending_topic.github_data or []),
-            top_languages=[],
-            top_contributors=[],
-            platform_stats=[]
-        )
-        
+        top_languages = []
+        top_contributors = []
+        platform_stats = []
+
         # GitHub analysis
         if trending_topic.github_data:
-            summary.top_languages = self.github_service.get_trending_languages(trending_topic.github_data)
-            summary.top_contributors = self.github_service.get_top_contributors(trending_topic.github_data)
-            
-            # GitHub platform stats
+            github_data = trending_topic.github_data
+            top_languages = self.github_service.get_trending_languages(github_data)
+            top_contributors = self.github_service.get_top_contributors(github_data)
+
+            # One pass over the repos: stars, forks and language keywords
+            # together, instead of a separate traversal per metric
+            total_stars = total_forks = 0
+            language_keywords = []
+            for repo in github_data:
+                total_stars += repo.stargazers_count
+                total_forks += repo.forks_count
+                if repo.language:
+                    language_keywords.append(repo.language)
+
             github_stats = PlatformStats(
                 platform=PlatformType.GITHUB,
-                total_items=len(trending_topic.github_data),
-                top_languages=summary.top_languages[:5],
+                total_items=len(github_data),
+                top_languages=top_languages[:5],
                 engagement_metrics={
-                    'total_stars': sum(repo.stargazers_count for repo in trending_topic.github_data),
-                    'total_forks': sum(repo.forks_count for repo in trending_topic.github_data),
-                    'avg_stars': sum(repo.stargazers_count for repo in trending_topic.github_data) / len(trending_topic.github_data)
+                    'total_stars': total_stars,
+                    'total_forks': total_forks,
+                    'avg_stars': total_stars / len(github_data)
                 },
-                trending_keywords=[repo.language for repo in trending_topic.github_data if repo.language]
+                trending_keywords=language_keywords
             )
-            summary.platform_stats.append(github_stats)
-        
-        return summary
+            platform_stats.append(github_stats)
+
+        # Twitter analysis
+        if trending_topic.twitter_data:
+            # get_engagement_metrics already computes every total in one
+            # vectorized pass - reuse it rather than re-summing here
+            twitter_metrics = self.twitter_service.get_engagement_metrics(trending_topic.twitter_data)
+            twitter_stats = PlatformStats(
+                platform=PlatformType.TWITTER,
+                total_items=len(trending_topic.twitter_data),
+                engagement_metrics={
+                    'total_likes': twitter_metrics.get('total_likes', 0),
+                    'total_retweets': twitter_metrics.get('total_retweets', 0),
+                    'total_engagement': twitter_metrics.get('total_engagement', 0),
+                    'avg_engagement': twitter_metrics.get('avg_engagement_per_post', 0.0)
+                },
+                trending_keywords=[
+                    hashtag
+                    for hashtag, count in twitter_metrics.get('trending_hashtags', [])
+                ]
+            )
+            platform_stats.append(twitter_stats)
+
+        # Reddit analysis
+        if trending_topic.reddit_data:
+            community_metrics = self.reddit_service.get_community_metrics(trending_topic.reddit_data)
+            reddit_stats = PlatformStats(
+                platform=PlatformType.REDDIT,
+                total_items=len(trending_topic.reddit_data),
+                engagement_metrics={
+                    'total_score': community_metrics.get('total_score', 0),
+                    'total_comments': community_metrics.get('total_comments', 0),
+                    'avg_score_per_post': community_metrics.get('avg_score_per_post', 0.0),
+                    'avg_upvote_ratio': community_metrics.get('avg_upvote_ratio', 0.0)
+                },
+                trending_keywords=[
+                    keyword['keyword']
+                    for keyword in self.reddit_service.get_trending_keywords(trending_topic.reddit_data)
+                ]
+            )
+            platform_stats.append(reddit_stats)
+
+        return AnalysisSummary(
+            total_repos=len(trending_topic.github_data or []),
+            top_languages=top_languages,
+            top_contributors=top_contributors,
+            platform_stats=platform_stats
+        )
 
     async def analyze_trending_with_nlp(self, natural_query: str, max_results: int = 20) -> Dict[str, Any]:
         """Analyze trending topics using natural language processing"""
         try:
             # Use GitHub service's NLP search
-            nlp_results = self.github_service.search_with_nlp(natural_query, max_results)
+            nlp_results = await self.github_service.search_with_nlp(natural_query, max_results)
             
             # Create trending topic
             trending_topic = TrendingTopic(
@@ -152,7 +311,7 @@ class TrendingAnalyzer:
             }
             
         except Exception as e:
-            print(f"Error in NLP trending analysis: {e}")
+            logger.warning("Error in NLP trending analysis: %s", e)
             return {
                 "error": str(e),
                 "trending_topic": None,